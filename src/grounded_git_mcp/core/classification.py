@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Literal
+from types import MappingProxyType
+from typing import Literal, Mapping
 
 
 Risk = Literal["low", "medium", "high", "critical"]
@@ -30,24 +31,82 @@ _WRITE = {"add", "rm", "mv", "commit", "stash", "tag", "branch", "merge", "cherr
 _NETWORK = {"push", "fetch", "pull", "clone", "ls-remote", "submodule"}
 
 
+# Plain read subcommands: never escalated by flags (e.g. `grep -f <file>` reads patterns).
+_READ = {"status", "log", "show", "diff", "blame", "grep", "rev-parse", "ls-files", "ls-tree", "cat-file"}
+
+# Per-subcommand flags that discard work (checkout -f, branch -D, rm -f, ...).
+# Subcommands not listed here are never escalated by flags: `add -f` only adds an
+# ignored file, `config -f` means --file. (reset/clean are denied outright.)
+_FORCE = frozenset({"-f", "--force"})
+_DESTRUCTIVE_FLAGS: dict[str, frozenset[str]] = {
+    "checkout": _FORCE,
+    "switch": _FORCE | {"--discard-changes"},
+    "branch": _FORCE | {"-D"},
+    "tag": _FORCE,
+    "mv": _FORCE,
+    "rm": _FORCE | {"-rf", "-fr"},
+}
+
+# Options whose next argv entry is a value (a message, a file, a branch name), not a flag.
+_VALUE_OPTIONS = frozenset({"-m", "-F", "--message", "--file", "-b", "-B"})
+
+
+def _entry(kind: str, risk: Risk, reason: str) -> Mapping[str, str]:
+    return MappingProxyType(asdict(Classification(kind=kind, risk=risk, reason=reason)))
+
+
+def _build_table() -> dict[str, Mapping[str, str]]:
+    table: dict[str, Mapping[str, str]] = {}
+    for sub in _READ:
+        table[sub] = _entry("read", "low", f"Read-only subcommand: {sub}")
+    for sub in _WRITE:
+        risk: Risk = "medium" if sub in {"add", "rm", "mv", "tag", "branch", "stash"} else "high"
+        table[sub] = _entry("write", risk, f"Write subcommand: {sub}")
+    for sub in _NETWORK:
+        table[sub] = _entry("network", "high", f"Network subcommand: {sub}")
+    for sub in _DENY:  # last: deny wins over network (push, fetch)
+        table[sub] = _entry("destructive", "critical", f"Denied subcommand: {sub}")
+    return table
+
+
+# subcommand -> shared read-only classification; one dict lookup per call
+_SUBCOMMAND_TABLE = _build_table()
+
+_NO_ARGS = _entry("read", "low", "No args.")
+
+
 def classify_git_args(args: list[str]) -> dict:
     """
     args are the git arguments excluding the leading 'git'.
     Example: ["commit", "-m", "msg"]
+
+    Returns a fresh dict; callers may store or mutate it.
     """
     if not args:
-        return asdict(Classification(kind="read", risk="low", reason="No args."))
+        return dict(_NO_ARGS)
 
     sub = args[0].lower()
-
-    if sub in _DENY:
-        return asdict(Classification(kind="destructive", risk="critical", reason=f"Denied subcommand: {sub}"))
-
-    if sub in _NETWORK:
-        return asdict(Classification(kind="network", risk="high", reason=f"Network subcommand: {sub}"))
-
-    if sub in _WRITE:
-        risk: Risk = "medium" if sub in {"add", "rm", "mv", "tag", "branch", "stash"} else "high"
-        return asdict(Classification(kind="write", risk=risk, reason=f"Write subcommand: {sub}"))
-
-    return asdict(Classification(kind="read", risk="low", reason=f"Assumed read-only: {sub}"))
+    c = _SUBCOMMAND_TABLE.get(sub)
+    if c is None:
+        c = {"kind": "read", "risk": "low", "reason": f"Assumed read-only: {sub}"}
+
+    destructive = _DESTRUCTIVE_FLAGS.get(sub)
+    if destructive is not None and len(args) > 1:
+        flags = _destructive_flags(args, destructive)
+        if flags:
+            return {"kind": "destructive", "risk": "critical", "reason": f"Destructive flag for {sub}: {' '.join(sorted(flags))}"}
+    return dict(c)
+
+
+def _destructive_flags(args: list[str], destructive: frozenset[str]) -> set[str]:
+    """Flags from `destructive` among the options of args[1:] (up to `--`, skipping option values)."""
+    found: set[str] = set()
+    it = iter(args[1:])
+    for a in it:
+        if a == "--":
+            break
+        if a in destructive:
+            found.add(a)
+        elif a in _VALUE_OPTIONS:
+            next(it, None)
+    return found
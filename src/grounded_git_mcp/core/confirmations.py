@@ -2,31 +2,115 @@ from __future__ import annotations
 
 import hashlib
 import json
+import threading
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from .atomic import atomic_write_bytes
+from .models import GitRunResult
 
-def _now() -> int:
-    return int(time.time())
+try:  # optional: much faster (de)serialization when installed
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
 
 
-def _sha256_text(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
 
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-def _stable_cmd_text(args: list[str]) -> str:
-    return "\n".join(args)
+    _loads = json.loads
 
+try:  # optional: compact binary snapshots
+    import msgpack
+except ImportError:  # pragma: no cover - depends on environment
+    msgpack = None
 
-@dataclass(frozen=True)
+# msgpack snapshots start with this byte (0xc1 is never emitted by msgpack, and JSON
+# snapshots always start with "{"), so either format can be read back.
+_MSGPACK_MAGIC = b"\xc1"
+
+
+def _encode_snapshot(data: dict[str, Any]) -> bytes:
+    if msgpack is not None:
+        return _MSGPACK_MAGIC + msgpack.packb(data, use_bin_type=True)
+    return _dumps(data)
+
+
+def _decode_snapshot(blob: bytes) -> dict[str, Any]:
+    if blob[:1] == _MSGPACK_MAGIC:
+        if msgpack is None:
+            raise RuntimeError("Confirmation snapshot is msgpack-encoded; install msgpack to read it.")
+        return msgpack.unpackb(blob[1:], raw=False)
+    return _loads(blob or b"{}")
+
+
+# Shared by every proposal response (immutable, so safe to hand out as-is).
+_PROPOSAL_NOTES = (
+    "Token is one-time and expires automatically.",
+    "Execution fails if HEAD/branch changed or conflicts exist (per preconditions).",
+)
+
+# The confirmations log is compacted into a snapshot once it holds more events than this.
+_COMPACT_AFTER = 512
+
+
+def now_s() -> int:
+    # integer seconds straight from the ns clock (no float rounding)
+    return time.time_ns() // 1_000_000_000
+
+
+def _hash_text(s: str) -> str:
+    # 64-bit BLAKE2b digest (16 hex chars): ids and tamper checks only need that much
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _apply_event(data: dict[str, Any], event: dict[str, Any]) -> None:
+    op = event.get("op")
+    if op == "put":
+        c = event["c"]
+        data[c["confirmation_id"]] = c
+    elif op == "used":
+        raw = data.get(event["id"])
+        if raw:
+            data[event["id"]] = {**raw, "used": int(event["used"])}
+
+
+def _canonical_cmd_bytes(args: list[str]) -> bytes:
+    # NUL-separated: argv entries cannot contain NUL, so the encoding is unambiguous
+    return b"\0".join(a.encode("utf-8") for a in args)
+
+
+@dataclass(frozen=True, slots=True)
 class Preconditions:
     expected_head: str | None = None
     expected_branch: str | None = None
     require_clean: bool = False
     require_no_conflicts: bool = True
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "expected_head": self.expected_head,
+            "expected_branch": self.expected_branch,
+            "require_clean": self.require_clean,
+            "require_no_conflicts": self.require_no_conflicts,
+        }
+
 
 @dataclass
 class Confirmation:
@@ -40,9 +124,64 @@ class Confirmation:
     max_uses: int = 1
     used: int = 0
     preconditions: Preconditions = Preconditions()
+    # shared by confirmations stored together via put_many (None for single proposals)
+    batch_id: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain-JSON form used by the store (cheaper than dataclasses.asdict)."""
+        return {
+            "confirmation_id": self.confirmation_id,
+            "root": self.root,
+            "args": list(self.args),
+            "classification": dict(self.classification),
+            "cmd_hash": self.cmd_hash,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "max_uses": self.max_uses,
+            "used": self.used,
+            "preconditions": self.preconditions.to_dict(),
+            "batch_id": self.batch_id,
+        }
+
+    def to_proposal_response(self, prompt_to_confirm: str) -> dict[str, Any]:
+        """Tool response for a freshly stored proposal."""
+        return {
+            "summary": "Proposal created. Requires explicit confirmation to execute.",
+            "confirmation_id": self.confirmation_id,
+            "classification": self.classification,
+            "args": self.args,
+            "expires_at": self.expires_at,
+            "preconditions": self.preconditions.to_dict(),
+            "prompt_to_confirm": prompt_to_confirm,
+            "notes": _PROPOSAL_NOTES,
+        }
+
+    def to_execute_response(self, res: GitRunResult) -> dict[str, Any]:
+        """Tool response (and audit payload) for an executed confirmation."""
+        return {
+            "summary": "Executed confirmed git command.",
+            "confirmation_id": self.confirmation_id,
+            "classification": self.classification,
+            "args": self.args,
+            "output": {
+                "stdout": res.stdout,
+                "stderr": res.stderr,
+                "exit_code": res.exit_code,
+                "duration_ms": res.duration_ms,
+                "timed_out": res.timed_out,
+                "output_truncated": res.output_truncated,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> "Confirmation":
+        return cls(
+            **{k: v for k, v in raw.items() if k != "preconditions"},
+            preconditions=Preconditions(**(raw.get("preconditions") or {})),
+        )
 
     def is_expired(self) -> bool:
-        return _now() > self.expires_at
+        return now_s() > self.expires_at
 
     def can_use(self) -> bool:
         return (not self.is_expired()) and self.used < self.max_uses
@@ -51,67 +190,178 @@ class Confirmation:
 class FileConfirmationStore:
     """
     Minimal durable store:
-      .grounded_git_mcp/confirmations.json
+      .grounded_git_mcp/confirmations.snapshot.json   (compacted state; msgpack if installed)
+      .grounded_git_mcp/confirmations.log.jsonl       (append-only ops since the snapshot)
       .grounded_git_mcp/audit.jsonl
+
+    put/mark_used append one small event to the log instead of rewriting the
+    whole store; the log is folded into a new snapshot once it grows past
+    _COMPACT_AFTER entries. Log events carry absolute values so replaying an
+    event twice (e.g. after a crash mid-compaction) is harmless.
     """
 
     def __init__(self, repo_root: Path) -> None:
         self._dir = repo_root / ".grounded_git_mcp"
         self._dir.mkdir(parents=True, exist_ok=True)
-        self._db = self._dir / "confirmations.json"
+        self._snapshot = self._dir / "confirmations.snapshot.json"
+        self._log = self._dir / "confirmations.log.jsonl"
         self._audit = self._dir / "audit.jsonl"
 
-        if not self._db.exists():
-            self._db.write_text("{}", encoding="utf-8")
+        # Replayed state, valid while the (snapshot, log) stat signatures are unchanged.
+        # The inode is part of the signature because snapshots are written by replacing
+        # the file, which catches rewrites that land within the same mtime tick.
+        self._cache: dict[str, Any] | None = None
+        self._cache_stat: tuple[Any, Any] | None = None
+        self._log_len = 0
+
+        legacy = self._dir / "confirmations.json"
+        if legacy.exists() and not self._snapshot.exists():
+            legacy.replace(self._snapshot)
 
     def _load(self) -> dict[str, Any]:
-        return json.loads(self._db.read_text(encoding="utf-8") or "{}")
+        key = (_stat_key(self._snapshot), _stat_key(self._log))
+        if self._cache is not None and key == self._cache_stat:
+            return self._cache
+
+        data: dict[str, Any] = {}
+        if key[0] is not None:
+            data = _decode_snapshot(self._snapshot.read_bytes())
+
+        n = 0
+        if key[1] is not None:
+            with self._log.open("rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    _apply_event(data, _loads(line))
+                    n += 1
+
+        self._cache = data
+        self._cache_stat = key
+        self._log_len = n
+        return data
+
+    def _append(self, data: dict[str, Any], *events: dict[str, Any]) -> None:
+        """Append events to the log (one write) and apply them to the cached state."""
+        blob = b"".join(_dumps(e) + b"\n" for e in events)
+        expected_size = (self._cache_stat[1] or (0, 0, 0))[2] + len(blob)
+
+        with self._log.open("ab") as f:
+            f.write(blob)
+        for e in events:
+            _apply_event(data, e)
+        self._log_len += len(events)
+
+        log_key = _stat_key(self._log)
+        if log_key is None or log_key[2] != expected_size:
+            # another writer appended concurrently; replay from disk next time
+            self._cache = None
+            return
+        self._cache_stat = (self._cache_stat[0], log_key)
+
+        if self._log_len > _COMPACT_AFTER:
+            self._compact(data)
 
-    def _save(self, data: dict[str, Any]) -> None:
-        tmp = self._db.with_suffix(".json.tmp")
-        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-        tmp.replace(self._db)
+    def _compact(self, data: dict[str, Any]) -> None:
+        """Fold the log into a fresh snapshot and truncate the log."""
+        atomic_write_bytes(self._snapshot, _encode_snapshot(data))
+        self._log.write_bytes(b"")
+
+        self._cache = data
+        self._cache_stat = (_stat_key(self._snapshot), _stat_key(self._log))
+        self._log_len = 0
 
     def put(self, c: Confirmation) -> None:
         data = self._load()
-        data[c.confirmation_id] = asdict(c)
-        self._save(data)
+        self._append(data, {"op": "put", "c": c.to_dict()})
         self.audit("proposed", c.confirmation_id, extra={"classification": c.classification})
 
+    def put_many(self, cs: list[Confirmation]) -> None:
+        """
+        Store several confirmations with a single log append.
+        They are stamped with a common batch_id, which marks them as one proposal.
+        """
+        if not cs:
+            return
+        batch_id = _hash_text("\n".join(c.confirmation_id for c in cs))
+        for c in cs:
+            c.batch_id = batch_id
+        data = self._load()
+        self._append(data, *({"op": "put", "c": c.to_dict()} for c in cs))
+        self._write_audit(*(
+            self._audit_line("proposed", c.confirmation_id, {"classification": c.classification}) for c in cs
+        ))
+
     def get(self, confirmation_id: str) -> Confirmation | None:
         data = self._load()
         raw = data.get(confirmation_id)
         if not raw:
             return None
-        raw["preconditions"] = Preconditions(**(raw.get("preconditions") or {}))
-        return Confirmation(**raw)
+        return Confirmation.from_dict(raw)
 
     def mark_used(self, c: Confirmation, result: dict[str, Any]) -> None:
         data = self._load()
         raw = data.get(c.confirmation_id)
         if not raw:
             return
-        raw["used"] = int(raw.get("used", 0)) + 1
-        data[c.confirmation_id] = raw
-        self._save(data)
+        self._append(data, {"op": "used", "id": c.confirmation_id, "used": int(raw.get("used", 0)) + 1})
         self.audit("executed", c.confirmation_id, extra={"result": result})
 
     def audit(self, action: str, confirmation_id: str, extra: dict[str, Any] | None = None) -> None:
+        self._write_audit(self._audit_line(action, confirmation_id, extra))
+
+    @staticmethod
+    def _audit_line(action: str, confirmation_id: str, extra: dict[str, Any] | None) -> bytes:
         line = {
-            "ts": _now(),
+            "ts": now_s(),
             "action": action,
             "confirmation_id": confirmation_id,
             **(extra or {}),
         }
-        with self._audit.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        return _dumps(line) + b"\n"
+
+    def _write_audit(self, *lines: bytes) -> None:
+        """Append audit lines to audit.jsonl with a single open/write."""
+        with self._audit.open("ab") as f:
+            f.write(b"".join(lines))
+
+
+_STORE_CACHE: dict[str, FileConfirmationStore] = {}
+_STORE_CACHE_LOCK = threading.Lock()
+
+
+def get_store(repo_root: Path) -> FileConfirmationStore:
+    """
+    Shared FileConfirmationStore per resolved root, so back-to-back propose/execute
+    reuse the replayed in-memory state instead of re-reading the log. Writes still
+    go straight to disk and reads still notice changes made by other processes.
+    """
+    key = str(repo_root)
+    with _STORE_CACHE_LOCK:
+        store = _STORE_CACHE.get(key)
+        if store is None or not store._dir.is_dir():  # state dir removed: start over
+            store = _STORE_CACHE[key] = FileConfirmationStore(repo_root)
+    return store
 
 
-def new_confirmation_id(root: Path, args: list[str]) -> str:
+def new_confirmation_id(
+    root: Path,
+    args: list[str],
+    *,
+    cmd_hash: str | None = None,
+    now: int | None = None,
+    position: int | None = None,
+) -> str:
     # deterministic-ish id is fine, but still unique enough: time + hash
-    seed = f"{root.resolve()}\n{_now()}\n{_stable_cmd_text(args)}"
-    return _sha256_text(seed)[:16]
+    # `root` must already be resolved (see resolve_root).
+    # Pass a precomputed command_hash(args) / timestamp to avoid recomputing them.
+    # `position` (index within a put_many batch) keeps repeated commands apart.
+    seed = f"{root}\n{now_s() if now is None else now}\n{cmd_hash or command_hash(args)}"
+    if position is not None:
+        seed += f"\n{position}"
+    return _hash_text(seed)
 
 
 def command_hash(args: list[str]) -> str:
-    return _sha256_text(_stable_cmd_text(args))
+    # 128-bit BLAKE2b over the canonical bytes (tamper detection, not secrecy)
+    return hashlib.blake2b(_canonical_cmd_bytes(args), digest_size=16).hexdigest()
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Any, Mapping
 
 
-@dataclass(eq=False)
 class GroundedGitMCPError(Exception):
     """Base error for the project."""
-    message: str = ""
-    context: Mapping[str, Any] | None = None
+    __slots__ = ("message", "context")
+
+    def __init__(self, message: str = "", context: Mapping[str, Any] | None = None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.context = context
 
     def __str__(self) -> str:
         if not self.context:
@@ -18,11 +20,14 @@ class GroundedGitMCPError(Exception):
 
 class InvalidRootError(GroundedGitMCPError):
     """Raised when repo root is invalid or outside allowed scope."""
+    __slots__ = ()
 
 
 class GitPolicyError(GroundedGitMCPError):
     """Raised when a git command violates the security policy."""
+    __slots__ = ()
 
 
 class GitExecutionError(GroundedGitMCPError):
     """Raised when executing a git command fails."""
+    __slots__ = ()
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Sequence
+
+from .git_runner import SafeGitRunner, _decode, _kill_process_group_posix, _kill_process_tree_windows, require_ok
+from .models import GitRunResult
+
+
+_BATCH_ARGV = ("git", "cat-file", "--batch")
+_READ_CHUNK = 1 << 16
+
+
+class BatchPipe:
+    """
+    A long-lived git process spoken to line by line over stdin/stdout, where every
+    read has a deadline. stdout is drained by a daemon thread into a queue, so a
+    stalled git (e.g. a promisor fetch in a partial clone) surfaces as TimeoutError
+    instead of blocking the caller; kill() then takes down the whole process group.
+    """
+
+    def __init__(self, argv: Sequence[str], *, cwd: str, env: dict[str, str]) -> None:
+        popen_kwargs: dict = {}
+        if os.name != "nt":
+            popen_kwargs["start_new_session"] = True
+        self._proc = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            **popen_kwargs,
+        )
+        self._chunks: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+        self._buf = bytearray()
+        self._eof = False
+        threading.Thread(target=self._pump, args=(self._proc.stdout,), daemon=True).start()
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    def _pump(self, stream) -> None:
+        try:
+            while chunk := stream.read1(_READ_CHUNK):
+                self._chunks.put(chunk)
+        except (OSError, ValueError):
+            pass
+        self._chunks.put(b"")
+
+    def alive(self) -> bool:
+        return not self._eof and self._proc.poll() is None
+
+    def send(self, line: bytes) -> None:
+        self._proc.stdin.write(line)
+        self._proc.stdin.flush()
+
+    def _fill(self, deadline: float) -> None:
+        if self._eof:
+            raise EOFError("git batch process exited")
+        try:
+            chunk = self._chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise TimeoutError("git batch process did not answer in time") from None
+        if not chunk:
+            self._eof = True
+            raise EOFError("git batch process exited")
+        self._buf += chunk
+
+    def readline(self, deadline: float) -> bytes:
+        """Next line including its newline."""
+        while (i := self._buf.find(b"\n")) < 0:
+            self._fill(deadline)
+        line = bytes(self._buf[: i + 1])
+        del self._buf[: i + 1]
+        return line
+
+    def read(self, n: int, deadline: float, *, keep: int | None = None) -> bytes:
+        """Exactly n bytes; only the first `keep` of them are returned (the rest is dropped)."""
+        keep = n if keep is None else min(n, keep)
+        out = bytearray()
+        left = n
+        while left > 0:
+            if not self._buf:
+                self._fill(deadline)
+            take = min(left, len(self._buf))
+            room = keep - len(out)
+            if room > 0:
+                out += self._buf[: min(take, room)]
+            del self._buf[:take]
+            left -= take
+        return bytes(out)
+
+    def kill(self) -> None:
+        p = self._proc
+        try:
+            p.stdin.close()
+        except Exception:
+            pass
+        if p.poll() is None:
+            try:
+                if os.name == "nt":
+                    _kill_process_tree_windows(p.pid)
+                else:
+                    _kill_process_group_posix(p)
+                p.wait(timeout=0.5)
+            except Exception:
+                pass
+
+
+class CatFileBatch:
+    """
+    Long-lived `git cat-file --batch` process for one repo root, used both for
+    reading blobs and for ref -> object id lookups.
+    Each request is one line on stdin and `<oid> <type> <size>\\n<content>\\n`
+    back on stdout, instead of a `git show` / `git rev-parse` fork/exec per call.
+    Thread-safe (one request at a time); use get_cat_file(), which shares one
+    process per root. Each request is bounded by the runner's timeout, so the lock
+    is never held longer than that: a stalled process is killed and respawned by
+    the next request.
+    """
+
+    def __init__(self, runner: SafeGitRunner) -> None:
+        self._runner = runner
+        self._pipe: BatchPipe | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> int | None:
+        return self._pipe.pid if self._pipe is not None else None
+
+    def _ensure(self) -> BatchPipe:
+        if self._pipe is None or not self._pipe.alive():
+            self._drop()
+            self._pipe = BatchPipe(_BATCH_ARGV, cwd=self._runner.root_str, env=self._runner._build_env(None))
+        return self._pipe
+
+    def read(self, spec: str, limit: int | None = None) -> tuple[bytes, str, bytes, bool] | None:
+        """
+        (object id, object type, content, truncated) for `spec` (e.g. "HEAD:README.md"),
+        or None if git reports it missing/ambiguous. At most `limit` bytes of content
+        are kept; the rest is read and discarded so the stream stays in sync.
+        Raises TimeoutError if git does not answer within the runner's timeout.
+        """
+        if "\n" in spec or "\r" in spec:
+            raise ValueError("object spec must be a single line")
+
+        with self._lock:
+            deadline = time.monotonic() + self._runner.config.timeout_s
+            p = self._ensure()
+            try:
+                p.send(spec.encode("utf-8") + b"\n")
+                parts = p.readline(deadline).split()
+                if len(parts) != 3:  # "<spec> missing" / "<spec> ambiguous"
+                    return None
+
+                size = int(parts[2])
+                data = p.read(size + 1, deadline, keep=size if limit is None else min(size, limit))  # + trailing "\n"
+            except (OSError, ValueError, EOFError, TimeoutError):
+                self._drop()
+                raise
+            return parts[0], parts[1].decode("ascii", "replace"), data, len(data) < size
+
+    def resolve_ref(self, ref: str) -> str:
+        """Object id for `ref` (e.g. "HEAD"); raises GitExecutionError if it cannot be resolved."""
+        try:
+            hit = self.read(ref, limit=0)
+        except (OSError, ValueError, EOFError, TimeoutError):
+            hit = None
+        if hit is not None:
+            return hit[0].decode("ascii")
+
+        # missing/ambiguous ref or dead/stalled pipe: let rev-parse produce the real answer/error
+        res = require_ok(self._runner.run(["rev-parse", ref]), context=f"resolve_ref({ref})")
+        return res.stdout.strip()
+
+    def _drop(self) -> None:
+        p, self._pipe = self._pipe, None
+        if p is not None:
+            p.kill()
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+
+_MAX_BATCHES = 16
+_BATCHES: OrderedDict[Path, CatFileBatch] = OrderedDict()
+_BATCHES_LOCK = threading.Lock()
+
+
+def get_cat_file(runner: SafeGitRunner) -> CatFileBatch:
+    """
+    Shared CatFileBatch for the runner's root (at most _MAX_BATCHES live; the
+    least recently used one is closed when another root needs a slot).
+    """
+    with _BATCHES_LOCK:
+        b = _BATCHES.get(runner.root)
+        if b is not None:
+            _BATCHES.move_to_end(runner.root)
+            return b
+        if len(_BATCHES) >= _MAX_BATCHES:
+            _BATCHES.popitem(last=False)[1].close()
+        b = _BATCHES[runner.root] = CatFileBatch(runner)
+    return b
+
+
+@atexit.register
+def _close_batches() -> None:
+    with _BATCHES_LOCK:
+        batches = list(_BATCHES.values())
+        _BATCHES.clear()
+    for b in batches:
+        b.close()
+
+
+def read_blob(runner: SafeGitRunner, spec: str) -> GitRunResult | None:
+    """
+    `git show <spec>` for a blob, answered by the runner's CatFileBatch and shaped
+    like the runner's own result (same output ceiling). None when `spec` is not a
+    readable blob; callers then fall back to the runner for the real output/error.
+    """
+    if "\n" in spec or "\r" in spec:
+        return None
+
+    start = time.perf_counter()
+    try:
+        hit = get_cat_file(runner).read(spec, limit=max(1, int(runner.config.max_output_chars)))
+    except (OSError, ValueError, EOFError, TimeoutError):
+        return None
+    if hit is None or hit[1] != "blob":
+        return None
+
+    stdout, _, truncated = runner._apply_output_ceiling(_decode(hit[2]), "")
+    return GitRunResult(
+        argv=[*_BATCH_ARGV, spec],
+        root=runner.root_str,
+        stdout=stdout,
+        stderr="",
+        exit_code=0,
+        duration_ms=int((time.perf_counter() - start) * 1000),
+        timed_out=False,
+        output_truncated=truncated or hit[3],
+    )
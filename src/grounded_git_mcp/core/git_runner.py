@@ -3,10 +3,13 @@ from __future__ import annotations
 import os
 import signal
 import subprocess
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from .errors import GitExecutionError, GitPolicyError
 from .models import GitRunResult
@@ -39,9 +42,83 @@ def _kill_process_group_posix(p: subprocess.Popen) -> None:
             pass
 
 
+_PIPE_CHUNK = 64 * 1024
+
+
+def _drain_pipe(stream, buf: bytearray, limit: int, overflow: list[bool]) -> None:
+    """
+    Read `stream` to EOF, keeping at most `limit` bytes in `buf`.
+    Anything beyond the limit is discarded (but still read, so the child never blocks).
+    """
+    try:
+        while True:
+            chunk = stream.read1(_PIPE_CHUNK)
+            if not chunk:
+                break
+            room = limit - len(buf)
+            if room >= len(chunk):
+                buf += chunk
+            else:
+                if room > 0:
+                    buf += chunk[:room]
+                overflow[0] = True
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except Exception:
+            pass
+
+
+def _decode(data: bytes) -> str:
+    # same result as text=True, errors="replace" (incl. universal newlines)
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+# Read-only policy tables (compared against stripped, lowercased args).
+# Whole-arg matches, so one set intersection covers every arg at once (no regex or
+# per-pattern scan needed).
+_DANGEROUS_FLAGS = frozenset({
+    "--global", "--system",
+    "--unset", "--unset-all", "--add", "--replace-all",
+    "--delete",
+    "--force", "-f", "-fd",
+    "--hard", "--onto",
+})
+_BRANCH_DELETE_FLAGS = frozenset({"-d", "--delete"})
+_TAG_DELETE_FLAGS = frozenset({"-d", "--delete"})
+_REMOTE_MUTATIONS = frozenset({"set-url", "add", "remove", "rename"})
+
+# Read-only subcommands whose output depends only on repository state, so a
+# result can be reused for a short time when the runner's cache is enabled.
+_PURE_SUBCMDS = frozenset({"rev-parse", "ls-tree", "cat-file", "show", "ls-files", "describe"})
+_CACHE_MAX_ENTRIES = 256
+
+
+def _is_cacheable(args: Sequence[str]) -> bool:
+    sub = args[0]
+    if sub in _PURE_SUBCMDS:
+        return True
+    return sub == "config" and "--get" in args
+
+
+@lru_cache(maxsize=256)
+def _static_argv(args: tuple[str, ...]) -> tuple[str, ...]:
+    """Interned ("git", *args) argv for run_static()."""
+    return ("git", *args)
+
+
+# Only the tail of stderr goes into error messages (git puts the fatal line last).
+_STDERR_TAIL_CHARS = 2_000
+
+
 def require_ok(res: GitRunResult, context: str) -> GitRunResult:
     if res.exit_code != 0:
-        raise GitExecutionError(f"{context} failed: {res.stderr.strip()}")
+        raise GitExecutionError(
+            f"{context} failed: {res.stderr[-_STDERR_TAIL_CHARS:].strip()}",
+            context={"argv": res.argv, "exit_code": res.exit_code, "timed_out": res.timed_out},
+        ) from None
     return res
 
 
@@ -53,6 +130,10 @@ class GitRunnerConfig:
     timeout_s: float = 3.0
     max_output_chars: int = 80_000
 
+    # Opt-in memoization of pure read-only commands (see _PURE_SUBCMDS).
+    # 0 disables it; callers that enable it must bump() after any write.
+    cache_ttl_s: float = 0.0
+
     # Read-only allowlist: prevents accidental destructive commands.
     read_only_allowlist: tuple[str, ...] = (
         "rev-parse",
@@ -70,9 +151,10 @@ class GitRunnerConfig:
         "grep",
         "blame",
         "ls-tree",
-         "merge-base",
+        "merge-base",
     )
 
+
 class SafeGitRunner:
     """
     Safe, local-only git runner:
@@ -86,7 +168,18 @@ class SafeGitRunner:
 
     def __init__(self, root: str | Path, config: GitRunnerConfig | None = None) -> None:
         self.root = resolve_root(root)
+        # string forms computed once; every run/result/tool response reuses them
+        self.root_str = str(self.root)
+        self.root_posix = self.root.as_posix()
         self.config = config or GitRunnerConfig()
+        self._allowlist = frozenset(self.config.read_only_allowlist)
+        self._cache: dict[tuple, tuple[float, GitRunResult]] = {}
+        self._validated: set[tuple[tuple[str, ...], bool]] = set()
+        self._env_template = self._make_env_template()
+
+    def bump(self) -> None:
+        """Drop memoized results (call after anything that may change the repo)."""
+        self._cache.clear()
 
     def run(
         self,
@@ -95,26 +188,73 @@ class SafeGitRunner:
         read_only: bool = True,
         env: dict[str, str] | None = None,
     ) -> GitRunResult:
-        args_list = list(args)
+        args_list = args if isinstance(args, list) else list(args)
         self._validate_args(args_list, read_only=read_only)
+        return self._run_checked(tuple(args_list), ["git", *args_list], read_only=read_only, env=env)
 
-        argv = ["git", *args_list]
+    def run_static(
+        self,
+        args: tuple[str, ...],
+        *,
+        read_only: bool = True,
+        env: dict[str, str] | None = None,
+    ) -> GitRunResult:
+        """
+        Like run(), for fixed commands whose args are already a tuple (argv built from
+        user input should go through run()). The tuple is used as-is for the memo key,
+        its validation is remembered per runner (bounded), and the "git"-prefixed argv
+        is interned once per distinct tuple.
+        """
+        if (args, read_only) not in self._validated:
+            self._validate_args(list(args), read_only=read_only)
+            if len(self._validated) >= _CACHE_MAX_ENTRIES:
+                self._validated.clear()
+            self._validated.add((args, read_only))
+        return self._run_checked(args, _static_argv(args), read_only=read_only, env=env)
+
+    def _run_checked(
+        self,
+        args: tuple[str, ...],
+        argv: Sequence[str],
+        *,
+        read_only: bool,
+        env: dict[str, str] | None,
+    ) -> GitRunResult:
+        ttl = self.config.cache_ttl_s
+        if ttl <= 0 or not read_only or env or not _is_cacheable(args):
+            return self._run_uncached(argv, env)
+
+        key = (self.root_str, args)
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+
+        res = self._run_uncached(argv, env)
+        if res.exit_code == 0 and not res.timed_out:
+            if len(self._cache) >= _CACHE_MAX_ENTRIES:
+                self._cache.clear()
+            self._cache[key] = (now, res)
+        return res
+
+    def _run_uncached(self, argv: Sequence[str], env: dict[str, str] | None) -> GitRunResult:
         merged_env = self._build_env(env)
 
         start = time.perf_counter()
-        stdout, stderr, exit_code, timed_out = self._run_process(
+        stdout, stderr, exit_code, timed_out, overflowed = self._run_process(
             argv=argv,
-            cwd=self.root,
+            cwd=self.root_str,
             env=merged_env,
             timeout_s=self.config.timeout_s,
         )
         duration_ms = int((time.perf_counter() - start) * 1000)
 
         stdout, stderr, output_truncated = self._apply_output_ceiling(stdout, stderr)
+        output_truncated = output_truncated or overflowed
 
         return GitRunResult(
-            argv=argv,
-            root=str(self.root),
+            argv=argv if isinstance(argv, list) else list(argv),
+            root=self.root_str,
             stdout=stdout,
             stderr=stderr,
             exit_code=exit_code,
@@ -129,78 +269,69 @@ class SafeGitRunner:
 
         if not read_only:
             return
-        args = [a.strip() for a in args_list]
-        lowered = [a.lower() for a in args]
-        subcmd = lowered[0]
-        if subcmd not in self.config.read_only_allowlist:
+        subcmd = args_list[0].strip().lower()
+        if subcmd not in self._allowlist:
             raise GitPolicyError(
                 f"Blocked git subcommand in read-only mode: '{subcmd}'. "
                 f"Allowed: {', '.join(self.config.read_only_allowlist)}"
             )
 
-        dangerous_flags = {
-            "--global", "--system",  
-            "--unset", "--unset-all", "--add", "--replace-all",
-            "--delete",              
-            "--force", "-f",         
-        }
+        lowered = {a.strip().lower() for a in args_list}
 
-        if any(f in lowered for f in dangerous_flags):
+        if not lowered.isdisjoint(_DANGEROUS_FLAGS):
             raise GitPolicyError(f"Blocked potentially mutating git flags in read-only mode: {args_list}")
 
-        if subcmd == "branch" and any(t in lowered for t in {"-d", "-D".lower(), "--delete"}):
+        if subcmd == "branch" and not lowered.isdisjoint(_BRANCH_DELETE_FLAGS):
             raise GitPolicyError("Blocked branch deletion in read-only mode.")
 
-        if subcmd == "tag" and any(t in lowered for t in {"-d", "--delete"}):
+        if subcmd == "tag" and not lowered.isdisjoint(_TAG_DELETE_FLAGS):
             raise GitPolicyError("Blocked tag deletion in read-only mode.")
 
-        if subcmd == "remote" and len(lowered) >= 2:
-            op = lowered[1]
-            if op in {"set-url", "add", "remove", "rename"}:
+        if subcmd == "remote" and len(args_list) >= 2:
+            if args_list[1].strip().lower() in _REMOTE_MUTATIONS:
                 raise GitPolicyError("Blocked remote mutation in read-only mode.")
 
-       
         if subcmd == "config":
-            if len(lowered) >= 3:
+            if len(args_list) >= 3:
                 raise GitPolicyError("Blocked config write in read-only mode.")
 
-
-
-    def _build_env(self, extra_env: dict[str, str] | None) -> dict[str, str]:
+    def _make_env_template(self) -> dict[str, str]:
         """
         Build a controlled environment that prevents interactive hangs.
+        Snapshotted once per runner; Popen never mutates it.
         """
         merged_env = dict(os.environ)
         merged_env.update(
             {
                 "GIT_TERMINAL_PROMPT": "0",
-                "GCM_INTERACTIVE": "Never",  
-                "GIT_PAGER": "cat",          
+                "GCM_INTERACTIVE": "Never",
+                "GIT_PAGER": "cat",
                 "LC_ALL": "C",
                 "GIT_OPTIONAL_LOCKS": "0",
-
             }
         )
-
-        if extra_env:
-            merged_env.update(extra_env)
-
         return merged_env
 
+    def _build_env(self, extra_env: dict[str, str] | None) -> dict[str, str]:
+        if extra_env:
+            return {**self._env_template, **extra_env}
+        return self._env_template
 
     def _run_process(
         self,
         *,
-        argv: list[str],
+        argv: Sequence[str],
         cwd: Path,
         env: dict[str, str],
         timeout_s: float,
-    ) -> tuple[str, str, int, bool]:
+    ) -> tuple[str, str, int, bool, bool]:
         """
-        Run a command safely using Popen + communicate(timeout) to guarantee:
+        Run a command safely using Popen + bounded pipe readers + wait(timeout) to guarantee:
           - hard timeout
           - deterministic cleanup of stuck processes
-        Returns: (stdout, stderr, exit_code, timed_out)
+          - bounded memory: each pipe keeps at most max_output_chars bytes; the rest
+            is drained and discarded so git never blocks on a full pipe
+        Returns: (stdout, stderr, exit_code, timed_out, overflowed)
         """
         # POSIX: allow killing full process group
         popen_kwargs: dict = {}
@@ -212,12 +343,9 @@ class SafeGitRunner:
                 argv,
                 cwd=str(cwd),
                 env=env,
-                stdin=subprocess.DEVNULL,  
+                stdin=subprocess.DEVNULL,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
                 shell=False,
                 **popen_kwargs,
             )
@@ -227,25 +355,24 @@ class SafeGitRunner:
         except Exception as e:
             raise GitExecutionError(f"Failed to spawn git: {type(e).__name__}: {e}") from e
 
+        limit = max(1, int(self.config.max_output_chars))
+        out_buf, err_buf = bytearray(), bytearray()
+        overflow = [False]
+        readers = [
+            threading.Thread(target=_drain_pipe, args=(p.stdout, out_buf, limit, overflow), daemon=True),
+            threading.Thread(target=_drain_pipe, args=(p.stderr, err_buf, limit, overflow), daemon=True),
+        ]
+        for t in readers:
+            t.start()
+
+        deadline = time.monotonic() + timeout_s
         timed_out = False
         try:
-            out, err = p.communicate(timeout=timeout_s)
-            stdout = out or ""
-            stderr = err or ""
-            exit_code = int(p.returncode or 0)
-            return stdout, stderr, exit_code, timed_out
+            exit_code = int(p.wait(timeout=timeout_s) or 0)
 
         except subprocess.TimeoutExpired:
             timed_out = True
-
-            try:
-                out, err = p.communicate(timeout=0.2)
-            except Exception:
-                out, err = ("", "")
-
-            stdout = out or ""
-            stderr = err or ""
-            exit_code = 124 
+            exit_code = 124
 
             # Hard cleanup
             try:
@@ -259,8 +386,6 @@ class SafeGitRunner:
                 except Exception:
                     pass
 
-            return stdout, stderr, exit_code, timed_out
-
         except Exception as e:
             # Ensure process is not left running
             try:
@@ -272,6 +397,25 @@ class SafeGitRunner:
                 pass
             raise GitExecutionError(f"Failed while running git: {type(e).__name__}: {e}") from e
 
+        # Helpers spawned by git (hooks, `!` aliases, ...) may keep the pipes open
+        # after git itself exits; the reads share the same overall deadline.
+        for t in readers:
+            t.join(timeout=0.5 if timed_out else max(0.0, deadline - time.monotonic()))
+        if not timed_out and any(t.is_alive() for t in readers):
+            timed_out = True
+            exit_code = 124
+            try:
+                if os.name == "nt":
+                    _kill_process_tree_windows(p.pid)
+                else:
+                    _kill_process_group_posix(p)
+            except Exception:
+                pass
+            for t in readers:
+                t.join(timeout=0.5)
+
+        return _decode(bytes(out_buf)), _decode(bytes(err_buf)), exit_code, timed_out, overflow[0]
+
     def _apply_output_ceiling(self, stdout: str, stderr: str) -> tuple[str, str, bool]:
         """
         Enforce output ceiling (stdout+stderr). Prefer keeping stderr.
@@ -291,3 +435,64 @@ class SafeGitRunner:
         stdout = stdout[:keep_stdout]
 
         return stdout, stderr, True
+
+
+@lru_cache(maxsize=1)
+def git_version() -> tuple[int, ...]:
+    """Installed git version, e.g. (2, 39, 5); (0,) if it cannot be determined."""
+    try:
+        out = subprocess.run(["git", "--version"], capture_output=True, text=True, timeout=GitRunnerConfig().timeout_s).stdout
+    except (OSError, subprocess.SubprocessError):
+        return (0,)
+    # "git version 2.39.5" / "git version 2.39.5.windows.1"
+    nums = []
+    for part in (out.split()[2:3] or [""])[0].split("."):
+        if not part.isdigit():
+            break
+        nums.append(int(part))
+    return tuple(nums) or (0,)
+
+
+@lru_cache(maxsize=32)
+def _runner_for(root: Path, config: GitRunnerConfig) -> SafeGitRunner:
+    return SafeGitRunner(root, config)
+
+
+def get_runner(root: str | Path, config: GitRunnerConfig | None = None) -> SafeGitRunner:
+    """
+    Shared SafeGitRunner per (resolved root, config).
+    Runners hold no per-call state (config is frozen), so reusing them is safe;
+    the root is still validated on every call. Use _runner_for.cache_clear()
+    if policy defaults are changed at runtime.
+    """
+    return _runner_for(resolve_root(root), config or GitRunnerConfig())
+
+
+# Shared pool for overlapping independent git calls. They mostly wait on a child
+# process, so the pool is not limited to the CPU count.
+_GIT_POOL = ThreadPoolExecutor(max_workers=max(4, os.cpu_count() or 1), thread_name_prefix="grounded-git")
+
+
+def git_pool() -> ThreadPoolExecutor:
+    """Process-wide executor for concurrent git calls (see AsyncGitRunner)."""
+    return _GIT_POOL
+
+
+class AsyncGitRunner:
+    """
+    Submits SafeGitRunner calls to the shared git pool.
+    SafeGitRunner is safe to share between threads: config is frozen and its only
+    mutable state (memo dict, validated-args set) is updated with single atomic ops.
+    """
+
+    def __init__(self, runner: SafeGitRunner) -> None:
+        self.runner = runner
+
+    def submit(
+        self,
+        args: Iterable[str],
+        *,
+        read_only: bool = True,
+        env: dict[str, str] | None = None,
+    ) -> Future[GitRunResult]:
+        return _GIT_POOL.submit(self.runner.run, list(args), read_only=read_only, env=env)
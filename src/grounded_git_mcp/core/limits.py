@@ -4,3 +4,20 @@ MAX_BYTES_TEXT = 200_000
 MAX_LINES_TEXT = 2_000
 MAX_TREE_ENTRIES = 20_000      
 GIT_TIMEOUT_SEC = 6.0
+
+
+def truncate_lines(text: str, max_lines: int) -> tuple[str, bool, int]:
+    """
+    (first max_lines lines of text, truncated?, total line count).
+    Lines are "\n"-separated and the result has no trailing newline. Only newlines
+    are counted/searched, so small outputs are returned without splitting them.
+    """
+    body = text[:-1] if text.endswith("\n") else text
+    total = body.count("\n") + 1 if text else 0
+    if total <= max_lines:
+        return body, False, total
+
+    cut = -1
+    for _ in range(max(1, max_lines)):
+        cut = body.find("\n", cut + 1)
+    return body[:cut] if max_lines > 0 else "", True, total
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+from collections import Counter
 from dataclasses import dataclass
 from typing import Iterable
 
@@ -9,27 +11,106 @@ class PorcelainEntry:
     xy: str
     path: str
     orig_path: str | None = None
+    kind: str = "unknown"
 
 
-def parse_status_porcelain(lines: Iterable[str]) -> list[PorcelainEntry]:
+_UNMERGED_XY = frozenset({"DD", "AU", "UD", "UA", "DU", "AA", "UU"})
+
+
+def _xy_kind(xy: str) -> str:
+    if xy in _UNMERGED_XY:
+        return "unmerged"
+    for code, kind in (("R", "renamed"), ("C", "copied"), ("A", "added"), ("D", "deleted"), ("T", "type_changed")):
+        if code in xy:
+            return kind
+    return "modified"
+
+
+# XY code -> (kind, record carries an orig_path), precomputed for every valid v1 code
+# so parsers dispatch with one dict lookup per entry.
+_XY_TABLE: dict[str, tuple[str, bool]] = {
+    x + y: (_xy_kind(x + y), "R" in x + y or "C" in x + y)
+    for x in " MTADRC"
+    for y in " MTADRC"
+    if x + y != "  "
+}
+_XY_TABLE.update({xy: ("unmerged", False) for xy in _UNMERGED_XY})
+_XY_TABLE["??"] = ("untracked", False)
+_XY_TABLE["!!"] = ("ignored", False)
+_XY_UNKNOWN = ("unknown", False)
+
+# One match per v1 status line over the whole buffer: XY code, then the rest after the space.
+_STATUS_RE = re.compile(r"^(..) (.*)$", re.M)
+
+
+def parse_status_porcelain(text: str | Iterable[str]) -> list[PorcelainEntry]:
     """
-    Parses `git status --porcelain=v1 -z` style (but we use newline output for simplicity).
+    Parses `git status --porcelain=v1` output (newline-separated).
+    Accepts the raw stdout string, or an iterable of lines for older callers.
     For v1 lines:
       XY <path>
       XY <path> -> <path2>   (rename)
     """
+    if not isinstance(text, str):
+        text = "\n".join(raw.rstrip("\n") for raw in text)
+
+    table = _XY_TABLE
     out: list[PorcelainEntry] = []
-    for raw in lines:
-        line = raw.rstrip("\n")
-        if not line:
+    append = out.append
+    for xy, rest in _STATUS_RE.findall(text):
+        kind, has_orig = table.get(xy, _XY_UNKNOWN)
+        i = rest.find(" -> ") if has_orig else -1
+        if i >= 0:
+            append(PorcelainEntry(xy, rest[i + 4:], rest[:i], kind))
+        else:
+            append(PorcelainEntry(xy, rest, None, kind))
+    return out
+
+
+# v2 record prefix -> number of space-separated fields before the path
+_V2_FIELDS = {"1": 8, "2": 9, "u": 10}
+
+
+def parse_status_porcelain_v2(text: str) -> list[PorcelainEntry]:
+    """
+    Parses `git status --porcelain=v2 -z` output into the same entries as v1
+    (XY with "." mapped back to " "). Records are NUL-terminated, the path is the
+    last field at a fixed position, and renames/copies state it explicitly:
+      1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+      2 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <Xscore> <path>\0<orig_path>
+      u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+      ? <path>  /  ! <path>
+    Header lines ("# ...") are skipped.
+    """
+    table = _XY_TABLE
+    out: list[PorcelainEntry] = []
+    append = out.append
+    fields = text.split("\0")
+    i, n = 0, len(fields)
+    while i < n:
+        rec = fields[i]
+        i += 1
+        tag = rec[:1]
+        if tag == "?":
+            append(PorcelainEntry("??", rec[2:], None, "untracked"))
+            continue
+        if tag == "!":
+            append(PorcelainEntry("!!", rec[2:], None, "ignored"))
             continue
-        xy = line[:2]
-        rest = line[3:] if len(line) >= 4 else ""
-        if " -> " in rest:
-            a, b = rest.split(" -> ", 1)
-            out.append(PorcelainEntry(xy=xy, path=b, orig_path=a))
+        nf = _V2_FIELDS.get(tag)
+        if nf is None:
+            continue
+
+        parts = rec.split(" ", nf)
+        if len(parts) <= nf:
+            continue
+        xy = parts[1].replace(".", " ")
+        kind = table.get(xy, _XY_UNKNOWN)[0]
+        if tag == "2" and i < n:
+            append(PorcelainEntry(xy, parts[nf], fields[i], kind))
+            i += 1
         else:
-            out.append(PorcelainEntry(xy=xy, path=rest))
+            append(PorcelainEntry(xy, parts[nf], None, kind))
     return out
 
 
@@ -43,28 +124,50 @@ def diff_summary_from_name_status(lines: Iterable[str]) -> dict:
     Returns a compact summary.
     """
     files: list[dict] = []
-    counts: dict[str, int] = {}
+    counts: Counter[str] = Counter()
     for raw in lines:
         line = raw.strip()
         if not line:
             continue
         parts = line.split("\t")
         code = parts[0]
-        counts[code[0]] = counts.get(code[0], 0) + 1
+        counts[code[0]] += 1
         if code.startswith("R") and len(parts) >= 3:
             files.append({"status": code, "from": parts[1], "to": parts[2]})
         else:
             files.append({"status": code, "path": parts[1] if len(parts) > 1 else ""})
-    return {"counts": counts, "files": files, "total": sum(counts.values())}
+    return {"counts": dict(counts), "files": files, "total": counts.total()}
+
+
+def diff_summary_from_raw_z(text: str) -> dict:
+    """
+    Parses `git diff --raw -z` output into the diff_summary_from_name_status shape:
+      :<modes> <oids> M\0file\0
+      :<modes> <oids> R100\0old\0new\0   (renames/copies carry two paths)
+    """
+    files: list[dict] = []
+    counts: Counter[str] = Counter()
+    fields = text.split("\0")
+    i, n = 0, len(fields)
+    while i < n:
+        meta = fields[i]
+        i += 1
+        if not meta.startswith(":"):
+            continue
+        code = meta.rsplit(" ", 1)[-1]
+        counts[code[0]] += 1
+        if code[0] in "RC" and i + 1 < n:
+            files.append({"status": code, "from": fields[i], "to": fields[i + 1]})
+            i += 2
+        else:
+            files.append({"status": code, "path": fields[i] if i < n else ""})
+            i += 1
+    return {"counts": dict(counts), "files": files, "total": counts.total()}
 
 
 def detect_conflicts_from_unmerged(lines: Iterable[str]) -> list[str]:
     """
     Parses `git diff --name-only --diff-filter=U` output.
     """
-    out: list[str] = []
-    for raw in lines:
-        p = raw.strip()
-        if p:
-            out.append(p)
-    return out
+    # --diff-filter=U already did the filtering; only blank lines need dropping
+    return [p for raw in lines if (p := raw.strip())]
@@ -1,19 +1,57 @@
 from __future__ import annotations
 
+import os
+import stat
+import time
 from pathlib import Path
 
 from .errors import InvalidRootError
 
 
+# Roots validated within this window are returned without touching the filesystem.
+# (A root removed in the meantime still fails when git is started in it.)
+_ROOT_TTL_S = 1.0
+_ROOT_CACHE_MAX = 1024
+_VALIDATED_ROOTS: dict[str, tuple[Path, float]] = {}
+
+# $HOME is constant for the process: "~" / "~/..." are expanded against this.
+_HOME = os.path.expanduser("~")
+
+
+def _expand_home(path: str | Path) -> str:
+    """os.path.expanduser() without the per-call environment/passwd lookup for "~"."""
+    s = os.fspath(path)
+    if s[:1] != "~":
+        return s
+    if len(s) == 1 or s[1] in "/\\":
+        return _HOME + s[1:]
+    return os.path.expanduser(s)  # "~user/..."
+
+
 def resolve_root(root: str | Path) -> Path:
     """Resolve and validate root directory for local-repo operations."""
-    p = Path(root).expanduser().resolve()
-
-    if not p.exists():
-        raise InvalidRootError(f"Root does not exist: {p}")
-    if not p.is_dir():
+    # Memoized per absolute path (relative roots are keyed by the current cwd) for
+    # _ROOT_TTL_S; after that symlinks are re-resolved, so a retargeted root is noticed.
+    s = _expand_home(root)
+    key = s if os.path.isabs(s) else os.path.join(os.getcwd(), s)
+
+    now = time.monotonic()
+    hit = _VALIDATED_ROOTS.get(key)
+    if hit is not None and now - hit[1] < _ROOT_TTL_S:
+        return hit[0]
+
+    p = Path(os.path.realpath(key))
+    # one stat answers both "exists" and "is a directory"
+    try:
+        st = os.stat(p)
+    except (FileNotFoundError, NotADirectoryError):
+        raise InvalidRootError(f"Root does not exist: {p}") from None
+    if not stat.S_ISDIR(st.st_mode):
         raise InvalidRootError(f"Root is not a directory: {p}")
 
+    if len(_VALIDATED_ROOTS) >= _ROOT_CACHE_MAX:
+        _VALIDATED_ROOTS.clear()
+    _VALIDATED_ROOTS[key] = (p, now)
     return p
 
 
@@ -29,17 +67,13 @@ def ensure_within_root(root: Path, target: Path) -> Path:
     Ensure `target` is inside `root` (prevents path traversal).
     Returns resolved target if valid.
     """
-    root = root.resolve()
-    target = target.expanduser().resolve()
-
-    try:
-        target.relative_to(root)
-    except ValueError as e:
-        raise InvalidRootError(f"Path escapes root. root={root} target={target}") from e
-
-    return target
-
-
-
+    rp = os.path.realpath(root)
+    tp = os.path.realpath(_expand_home(target))
 
+    # plain string containment on resolved paths (normcase: case-insensitive on Windows)
+    r, t = os.path.normcase(rp), os.path.normcase(tp)
+    prefix = r if r.endswith(os.sep) else r + os.sep
+    if t != r and not t.startswith(prefix):
+        raise InvalidRootError(f"Path escapes root. root={rp} target={tp}")
 
+    return Path(tp)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from ..core.git_runner import SafeGitRunner, require_ok
-from ..core.limits import MAX_LINES_TEXT
+from ..core.git_runner import get_runner, require_ok
+from ..core.limits import MAX_LINES_TEXT, truncate_lines
+from ..core.parsers import diff_summary_from_raw_z
 from ..core.security import resolve_root, normalize_relpath
 
 
@@ -12,18 +13,24 @@ def diff_range(
     *,
     triple_dot: bool = False,
     pathspec: list[str] | None = None,
+    include_patch: bool = True,
 ) -> dict:
     """
     Compute diff between two refs.
     - base..head : changes in head not in base
     - base...head: changes from merge-base(base, head) to head
+    include_patch=False skips patch text: `diff` is empty and `files` holds the
+    changed paths from `git diff --raw -z -M` (no content diffing).
     """
-    runner = SafeGitRunner(root)
+    runner = get_runner(root)
 
     repo_root = (root)
     rng = f"{base}{'...' if triple_dot else '..'}{head}"
 
-    args = ["diff", "--patch", "--no-color", rng]
+    if include_patch:
+        args = ["diff", "--patch", "--no-color", rng]
+    else:
+        args = ["diff", "--raw", "-z", "-M", "--no-color", rng]
     if pathspec:
         # pathspec entries must be clean strings
         cleaned = [normalize_relpath(p) for p in pathspec if (p or "").strip()]
@@ -34,11 +41,21 @@ def diff_range(
             runner.run(args),
             context="diff_range(diff)",
         )
-    lines = res.stdout.splitlines()
-    truncated = False
-    if len(lines) > MAX_LINES_TEXT:
-        lines = lines[:MAX_LINES_TEXT]
-        truncated = True
+    if not include_patch:
+        return {
+            "root": str(repo_root),
+            "range": rng,
+            "base": base,
+            "head": head,
+            "triple_dot": triple_dot,
+            "pathspec": pathspec or [],
+            "truncated": res.output_truncated,
+            "diff": "",
+            "files": diff_summary_from_raw_z(res.stdout),
+            "git": res.__dict__,
+        }
+
+    diff, truncated, _ = truncate_lines(res.stdout, MAX_LINES_TEXT)
 
     return {
         "root": str(repo_root),
@@ -48,6 +65,6 @@ def diff_range(
         "triple_dot": triple_dot,
         "pathspec": pathspec or [],
         "truncated": truncated,
-        "diff": "\n".join(lines),
+        "diff": diff,
         "git": res.__dict__,
     }
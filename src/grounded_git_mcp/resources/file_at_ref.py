@@ -1,40 +1,37 @@
 from __future__ import annotations
 
-from ..core.git_runner import SafeGitRunner, require_ok
-from ..core.limits import MAX_LINES_TEXT
-from ..core.security import resolve_root, normalize_relpath
+from ..core.git_cat_file import read_blob
+from ..core.git_runner import get_runner, require_ok
+from ..core.limits import MAX_LINES_TEXT, truncate_lines
+from ..core.security import normalize_relpath
 
 
 def read_file_at_ref(root: str = ".", ref: str = "HEAD", path: str = "") -> dict:
     """
     Read a file content at a given git ref without checking out.
     """
-    runner = SafeGitRunner(root)
+    runner = get_runner(root)
 
-    repo_root = resolve_root(root)
+    repo_root = runner.root
     rel = normalize_relpath(path)
     if not rel:
         raise ValueError("path is required")
 
     spec = f"{ref}:{rel}"
-    res = require_ok(
-            runner.run(["show", f"{ref}:{rel}"]),
+    # blobs come from the shared `cat-file --batch` process; anything else (trees,
+    # missing paths, bad refs) goes through `git show` for its output/error
+    res = read_blob(runner, spec) or require_ok(
+            runner.run(["show", spec]),
             context="read_file_at_ref(show)",
         )
-    lines = res.stdout.splitlines()
-    truncated = False
-    if len(lines) > MAX_LINES_TEXT:
-        lines = lines[:MAX_LINES_TEXT]
-        truncated = True
-
-    content = "\n".join(lines)
+    content, truncated, line_count = truncate_lines(res.stdout, MAX_LINES_TEXT)
 
     return {
         "root": str(repo_root),
         "ref": ref,
         "path": rel,
         "truncated": truncated,
-        "line_count": len(res.stdout.splitlines()),
+        "line_count": line_count,
         "content": content,
         "git": res.__dict__,
     }
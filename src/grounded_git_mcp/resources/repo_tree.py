@@ -3,35 +3,44 @@ from __future__ import annotations
 from pathlib import Path
 
 from ..core.limits import MAX_TREE_ENTRIES
-from ..core.security import resolve_root
 
-from ..core.git_runner import SafeGitRunner, require_ok
+from ..core.git_runner import get_runner, require_ok
 
 
-def repo_tree(root: str = ".", ref: str = "HEAD") -> dict:
+def repo_tree(root: str = ".", ref: str = "HEAD", *, include_size: bool = False) -> dict:
     """
     Returns repository tree (paths) at a given ref using `git ls-tree`.
+    Blob paths only by default; include_size=True adds each blob's size
+    (`ls-tree -l`, which has to look up every object and is much slower).
     """
-    repo_root = resolve_root(root)
-    runner = SafeGitRunner(root)
+    runner = get_runner(root)
+    repo_root = runner.root
 
+    # `ref` is caller input, so this goes through run() rather than run_static()
+    args = ["ls-tree", "-r", "-l" if include_size else "--name-only", "-z", ref]
     res = require_ok(
-    runner.run(
-        ["ls-tree", "-r", "-t", "--name-only", ref],
-        read_only=True,
-    ),
+    runner.run(args, read_only=True),
     context="repo_tree(ls-tree)",
 )
 
 
-    lines = [ln.strip() for ln in res.stdout.splitlines() if ln.strip()]
+    # -z: NUL-terminated, unquoted paths (safe for spaces/newlines/non-ASCII)
+    lines = [p for p in res.stdout.split("\0") if p]
     total = len(lines)
     truncated = False
     if total > MAX_TREE_ENTRIES:
         lines = lines[:MAX_TREE_ENTRIES]
         truncated = True
 
-    items = [{"path": p} for p in lines]
+    if include_size:
+        # "<mode> <type> <oid> <size>\t<path>"; size is "-" for submodules
+        items = []
+        for line in lines:
+            meta, _, path = line.partition("\t")
+            size = meta.rsplit(None, 1)[-1]
+            items.append({"path": path, "size": int(size) if size.isdigit() else None})
+    else:
+        items = [{"path": p} for p in lines]
 
     return {
         "root": str(repo_root),
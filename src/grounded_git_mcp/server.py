@@ -14,7 +14,12 @@ from grounded_git_mcp.tools import (
     show_commit,
     status_porcelain,
 )
-from grounded_git_mcp.tools.approval_flow import execute_confirmed, propose_git_command
+from grounded_git_mcp.tools.approval_flow import (
+    execute_confirmed,
+    execute_confirmed_many,
+    propose_git_command,
+    propose_git_commands,
+)
 
 mcp = FastMCP("grounded-git-mcp")
 
@@ -73,6 +78,29 @@ def propose_git_command_tool(
 def execute_confirmed_tool(root: str = ".", confirmation_id: str = "", user_confirmation: str = "") -> dict:
     return execute_confirmed(root=root, confirmation_id=confirmation_id, user_confirmation=user_confirmation)
 
+
+@mcp.tool()
+def propose_git_commands_tool(
+    root: str = ".",
+    args_list: list[list[str]] = [],
+    expected_branch: str | None = None,
+    require_clean: bool = False,
+) -> dict:
+    return propose_git_commands(
+        root=root, args_list=args_list, expected_branch=expected_branch, require_clean=require_clean
+    )
+
+
+@mcp.tool()
+def execute_confirmed_many_tool(
+    root: str = ".",
+    confirmation_ids: list[str] = [],
+    user_confirmation: str = "",
+) -> dict:
+    return execute_confirmed_many(
+        root=root, confirmation_ids=confirmation_ids, user_confirmation=user_confirmation
+    )
+
 # resource:
 
 @mcp.resource("repo://{root}/{ref}/tree")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hmac
+import threading
 import time
 from pathlib import Path
 from typing import Any
@@ -9,14 +11,25 @@ from grounded_git_mcp.core.confirmations import (
     FileConfirmationStore,
     Preconditions,
     command_hash,
+    get_store,
     new_confirmation_id,
+    now_s,
 )
 from grounded_git_mcp.core.classification import classify_git_args
-from grounded_git_mcp.core.git_runner import SafeGitRunner, require_ok
+from grounded_git_mcp.core.git_cat_file import get_cat_file
+from grounded_git_mcp.core.git_runner import SafeGitRunner, get_runner, git_pool, require_ok
 from grounded_git_mcp.core.errors import GitExecutionError, GitPolicyError
+from grounded_git_mcp.core.security import resolve_root
 
 
-_CONFIRM_TTL_SECONDS = 30 * 60 
+_CONFIRM_TTL_SECONDS = 30 * 60
+_CONFIRM_PREFIX = "I CONFIRM "
+
+# Short-lived HEAD stamp per root: collapses bursts of proposals into one lookup.
+# Safe because execute_confirmed re-validates HEAD against the repo.
+_HEAD_TTL_S = 0.5
+_HEAD_CACHE: dict[str, tuple[str, float]] = {}
+_HEAD_CACHE_LOCK = threading.Lock()
 
 
 def _require_ok(ok: bool, msg: str) -> None:
@@ -25,7 +38,8 @@ def _require_ok(ok: bool, msg: str) -> None:
 
 
 def _repo_path(root: str) -> Path:
-    return Path(root).resolve()
+    # memoized resolution shared with get_runner (no per-call readlink chain)
+    return resolve_root(root)
 
 
 def _git_stdout(runner: SafeGitRunner, args: list[str], *, context: str, read_only: bool) -> str:
@@ -34,42 +48,145 @@ def _git_stdout(runner: SafeGitRunner, args: list[str], *, context: str, read_on
     return (res.stdout or "").strip()
 
 
+def _get_cached_head(root_str: str) -> str | None:
+    """
+    HEAD captured for `root_str` within the last _HEAD_TTL_S, else None.
+    Token issuance may use a HEAD up to that old: execute_confirmed re-checks it.
+    """
+    with _HEAD_CACHE_LOCK:
+        hit = _HEAD_CACHE.get(root_str)
+    if hit is not None and time.monotonic() - hit[1] < _HEAD_TTL_S:
+        return hit[0]
+    return None
+
+
+def _current_head(runner: SafeGitRunner) -> str:
+    head = _get_cached_head(runner.root_str)
+    if head is not None:
+        return head
+
+    now = time.monotonic()
+    head = get_cat_file(runner).resolve_ref("HEAD")
+    with _HEAD_CACHE_LOCK:
+        _HEAD_CACHE[runner.root_str] = (head, now)
+    return head
+
+
+def _forget_head(runner: SafeGitRunner) -> None:
+    with _HEAD_CACHE_LOCK:
+        _HEAD_CACHE.pop(runner.root_str, None)
+
+
 def _check_preconditions(runner: SafeGitRunner, p: Preconditions) -> None:
+    # The queries are independent read-only git calls, so run them concurrently
+    # and validate afterwards (in the same order as before).
+    queries: list[tuple[str, list[str]]] = []
     if p.expected_branch:
-        branch = _git_stdout(
-            runner,
-            ["rev-parse", "--abbrev-ref", "HEAD"],
-            context="precondition(branch)",
-            read_only=True,
-        )
+        # one process for both: prints the HEAD sha, then the abbreviated branch name
+        queries.append(("head/branch", ["rev-parse", "HEAD", "--abbrev-ref", "HEAD"]))
+    elif p.expected_head:
+        queries.append(("head", ["HEAD"]))
+    if p.require_clean:
+        queries.append(("clean", ["status", "--porcelain"]))
+    if p.require_no_conflicts:
+        queries.append(("conflicts", ["diff", "--name-only", "--diff-filter=U"]))
+
+    def query(q: tuple[str, list[str]]) -> str:
+        if q[0] == "head":
+            # persistent cat-file process (shared per root); no fork/exec
+            return get_cat_file(runner).resolve_ref(q[1][0])
+        return _git_stdout(runner, q[1], context=f"precondition({q[0]})", read_only=True)
+
+    if len(queries) > 1:
+        outputs = list(git_pool().map(query, queries))
+    else:
+        outputs = [query(q) for q in queries]
+    out = dict(zip((name for name, _ in queries), outputs))
+
+    if "head/branch" in out:
+        lines = out["head/branch"].splitlines()
+        head = lines[0] if lines else ""
+        branch = lines[1] if len(lines) > 1 else ""
         _require_ok(branch == p.expected_branch, f"Branch changed: expected {p.expected_branch}, got {branch}")
+    else:
+        head = out.get("head", "")
 
     if p.expected_head:
-        head = _git_stdout(
-            runner,
-            ["rev-parse", "HEAD"],
-            context="precondition(head)",
-            read_only=True,
-        )
         _require_ok(head == p.expected_head, "HEAD changed since approval.")
 
     if p.require_clean:
-        st = _git_stdout(
-            runner,
-            ["status", "--porcelain"],
-            context="precondition(clean)",
-            read_only=True,
-        )
-        _require_ok(st == "", "Working tree is not clean.")
+        _require_ok(out["clean"] == "", "Working tree is not clean.")
 
     if p.require_no_conflicts:
-        unmerged = _git_stdout(
-            runner,
-            ["diff", "--name-only", "--diff-filter=U"],
-            context="precondition(conflicts)",
-            read_only=True,
-        )
-        _require_ok(unmerged == "", "Unmerged/conflicted files detected.")
+        _require_ok(out["conflicts"] == "", "Unmerged/conflicted files detected.")
+
+
+def _classify_for_proposal(args: list[str]) -> dict[str, Any]:
+    """classify_git_args; critical commands are refused."""
+    classification = classify_git_args(args)
+    _require_ok(classification["risk"] != "critical", f"Command rejected: {classification['reason']}")
+    return classification
+
+
+def _build_preconditions(expected_head: str, expected_branch: str | None, require_clean: bool) -> Preconditions:
+    return Preconditions(
+        expected_head=expected_head,
+        expected_branch=expected_branch,
+        require_clean=require_clean,
+        require_no_conflicts=True,
+    )
+
+
+def _new_confirmation(
+    root_path: Path,
+    args: list[str],
+    classification: dict[str, Any],
+    preconditions: Preconditions,
+    now: int,
+    position: int | None = None,
+) -> Confirmation:
+    cmd_hash = command_hash(args)
+    return Confirmation(
+        confirmation_id=new_confirmation_id(root_path, args, cmd_hash=cmd_hash, now=now, position=position),
+        root=str(root_path),
+        args=args,
+        classification=classification,
+        cmd_hash=cmd_hash,
+        created_at=now,
+        expires_at=now + _CONFIRM_TTL_SECONDS,
+        max_uses=1,
+        used=0,
+        preconditions=preconditions,
+    )
+
+
+def _require_phrase(user_confirmation: str, expected_phrase: str) -> None:
+    # constant-time compare (bytes: compare_digest rejects non-ASCII str)
+    _require_ok(
+        hmac.compare_digest(user_confirmation.strip().encode("utf-8"), expected_phrase.encode("utf-8")),
+        f"Invalid confirmation phrase. Use: {expected_phrase}",
+    )
+
+
+def _load_usable(store: FileConfirmationStore, confirmation_id: str, root_str: str) -> Confirmation:
+    confirmation = store.get(confirmation_id)
+    _require_ok(confirmation is not None, "Unknown confirmation_id.")
+    _require_ok(confirmation.root == root_str, "Token repo_root mismatch.")
+    _require_ok(confirmation.can_use(), "Token expired or already used.")
+
+    _require_ok(command_hash(confirmation.args) == confirmation.cmd_hash, "Command hash mismatch (tampering detected).")
+    return confirmation
+
+
+def _run_confirmed(runner: SafeGitRunner, store: FileConfirmationStore, confirmation: Confirmation) -> dict[str, Any]:
+    res = runner.run(confirmation.args, read_only=False)
+    runner.bump()
+    _forget_head(runner)
+    require_ok(res, context="execute_confirmed(run)")
+
+    result = confirmation.to_execute_response(res)
+    store.mark_used(confirmation, result=result)
+    return result
 
 
 def propose_git_command(
@@ -84,58 +201,55 @@ def propose_git_command(
     The command is NOT executed here.
     """
     root_path = _repo_path(root)
-    runner = SafeGitRunner(root_path)  
-    store = FileConfirmationStore(root_path)
 
-    classification = classify_git_args(args)
-    _require_ok(classification["risk"] != "critical", f"Command rejected: {classification['reason']}")
+    classification = _classify_for_proposal(args)
 
-    expected_head = _git_stdout(
-        runner,
-        ["rev-parse", "HEAD"],
-        context="propose(expected_head)",
-        read_only=True,
-    )
+    # the runner is only needed to read HEAD; skip it when a recent capture exists
+    expected_head = _get_cached_head(str(root_path))
+    if expected_head is None:
+        expected_head = _current_head(get_runner(root_path))
 
-    ConfirmationID = new_confirmation_id(root_path, args)
-    now = int(time.time())
+    preconditions = _build_preconditions(expected_head, expected_branch, require_clean)
+    c = _new_confirmation(root_path, args, classification, preconditions, now_s())
+    get_store(root_path).put(c)
 
-    pending_confirmation = Confirmation(
-        confirmation_id=ConfirmationID,
-        root=str(root_path),
-        args=args,
-        classification=classification,
-        cmd_hash=command_hash(args),
-        created_at=now,
-        expires_at=now + _CONFIRM_TTL_SECONDS,
-        max_uses=1,
-        used=0,
-        preconditions=Preconditions(
-            expected_head=expected_head,
-            expected_branch=expected_branch,
-            require_clean=require_clean,
-            require_no_conflicts=True,
-        ),
-    )
-    store.put(pending_confirmation)
+    return c.to_proposal_response(_CONFIRM_PREFIX + c.confirmation_id)
+
+
+def propose_git_commands(
+    *,
+    root: str = ".",
+    args_list: list[list[str]],
+    expected_branch: str | None = None,
+    require_clean: bool = False,
+) -> dict[str, Any]:
+    """
+    Batch variant of propose_git_command: one HEAD read and one store append for
+    all commands. Nothing is stored if any command is rejected.
+    The commands are NOT executed here.
+    """
+    _require_ok(bool(args_list), "No commands to propose.")
+    root_path = _repo_path(root)
 
+    classifications = [_classify_for_proposal(args) for args in args_list]
+
+    expected_head = _get_cached_head(str(root_path))
+    if expected_head is None:
+        expected_head = _current_head(get_runner(root_path))
+
+    preconditions = _build_preconditions(expected_head, expected_branch, require_clean)
+    now = now_s()
+    cs = [
+        _new_confirmation(root_path, args, cl, preconditions, now, position=i)
+        for i, (args, cl) in enumerate(zip(args_list, classifications))
+    ]
+    get_store(root_path).put_many(cs)
+
+    cids = [c.confirmation_id for c in cs]
     return {
-        "summary": "Proposal created. Requires explicit confirmation to execute.",
-        "confirmation_id": ConfirmationID,
-        "classification": classification,
-        "args": args,
-        "expires_at": pending_confirmation.expires_at,
-        "preconditions": {
-            "expected_head": pending_confirmation.preconditions.expected_head,
-            "expected_branch": pending_confirmation.preconditions.expected_branch,
-            "require_clean": pending_confirmation.preconditions.require_clean,
-            "require_no_conflicts": pending_confirmation.preconditions.require_no_conflicts,
-        },
-        "prompt_to_confirm": f"I CONFIRM {ConfirmationID}",
-        "notes": [
-            "Token is one-time and expires automatically.",
-            "Execution fails if HEAD/branch changed or conflicts exist (per preconditions).",
-        ],
+        "summary": f"{len(cs)} proposals created. Requires explicit confirmation to execute.",
+        "proposals": [c.to_proposal_response(_CONFIRM_PREFIX + c.confirmation_id) for c in cs],
+        "prompt_to_confirm_all": _CONFIRM_PREFIX + " ".join(cids),
     }
 
 
@@ -148,38 +262,57 @@ def execute_confirmed(
     """
     Execute the exact previously proposed command only after explicit user confirmation.
     """
+    # cheap checks first: a wrong phrase is rejected without touching the repo or the store
+    _require_phrase(user_confirmation, _CONFIRM_PREFIX + confirmation_id)
+
     root_path = _repo_path(root)
-    runner = SafeGitRunner(root_path) 
-    store = FileConfirmationStore(root_path)
+    store = get_store(root_path)
+    confirmation = _load_usable(store, confirmation_id, str(root_path))
 
-    confirmation = store.get(confirmation_id)
-    _require_ok(confirmation is not None, "Unknown confirmation_id.")
-    _require_ok(confirmation.root == str(root_path), "Token repo_root mismatch.")
-    _require_ok(confirmation.can_use(), "Token expired or already used.")
+    runner = get_runner(root_path)
+    _check_preconditions(runner, confirmation.preconditions)
+    return _run_confirmed(runner, store, confirmation)
 
-    expected_phrase = f"I CONFIRM {confirmation_id}"
-    _require_ok(user_confirmation.strip() == expected_phrase, f"Invalid confirmation phrase. Use: {expected_phrase}")
 
-    _require_ok(command_hash(confirmation.args) == confirmation.cmd_hash, "Command hash mismatch (tampering detected).")
+def execute_confirmed_many(
+    *,
+    root: str = ".",
+    confirmation_ids: list[str],
+    user_confirmation: str,
+) -> dict[str, Any]:
+    """
+    Execute several proposed commands, in order, after one explicit confirmation
+    ("I CONFIRM <id1> <id2> ..."). All tokens are validated before anything runs.
+    When every token comes from the same propose_git_commands batch, their shared
+    preconditions are checked once up front (later commands of the batch may
+    legitimately move HEAD or dirty the tree); otherwise each command's
+    preconditions are checked right before it.
+    Stops at the first failing command; commands already run stay executed.
+    """
+    _require_ok(bool(confirmation_ids), "No confirmation ids given.")
+    _require_ok(len(set(confirmation_ids)) == len(confirmation_ids), "Duplicate confirmation ids.")
+    _require_phrase(user_confirmation, _CONFIRM_PREFIX + " ".join(confirmation_ids))
 
-    _check_preconditions(runner, confirmation.preconditions)
+    root_path = _repo_path(root)
+    store = get_store(root_path)
+    root_str = str(root_path)
+    confirmations = [_load_usable(store, cid, root_str) for cid in confirmation_ids]
 
-    res = runner.run(confirmation.args, read_only=False)
-    require_ok(res, context="execute_confirmed(run)")
+    runner = get_runner(root_path)
+    batch_ids = {c.batch_id for c in confirmations}
+    shared = len(batch_ids) == 1 and None not in batch_ids
+    if shared:
+        _check_preconditions(runner, confirmations[0].preconditions)
+
+    results = []
+    for c in confirmations:
+        # re-read right before running: the token may have been used meanwhile
+        _load_usable(store, c.confirmation_id, root_str)
+        if not shared:
+            _check_preconditions(runner, c.preconditions)
+        results.append(_run_confirmed(runner, store, c))
 
-    result = {
-        "summary": "Executed confirmed git command.",
-        "confirmation_id": confirmation_id,
-        "classification": confirmation.classification,
-        "args": confirmation.args,
-        "output": {
-            "stdout": res.stdout,
-            "stderr": res.stderr,
-            "exit_code": res.exit_code,
-            "duration_ms": res.duration_ms,
-            "timed_out": res.timed_out,
-            "output_truncated": res.output_truncated,
-        },
+    return {
+        "summary": f"Executed {len(results)} confirmed git commands.",
+        "results": results,
     }
-    store.mark_used(confirmation, result=result)
-    return result
@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import Any
 
 from .common import clean_lines, make_runner
+from ..core.git_runner import git_version, require_ok
 from ..core.parsers import (
     detect_conflicts_from_unmerged,
     diff_summary_from_name_status,
-    parse_status_porcelain,
+    parse_status_porcelain_v2,
 )
 
 
@@ -15,19 +16,35 @@ def repo_info(root: str = ".") -> dict[str, Any]:
     High-signal repo metadata: root, is_git, branch, head_sha, upstream (if exists).
     """
     r = make_runner(root)
-    is_git = r.run(["rev-parse", "--is-inside-work-tree"]).stdout.strip() == "true"
+
+    # One process for all four queries; rev-parse prints answers in order and stops
+    # at the first failure, so three lines + nonzero exit means only @{u} failed
+    # (no upstream / detached HEAD).
+    res = r.run_static(("rev-parse", "--is-inside-work-tree", "HEAD", "--abbrev-ref", "HEAD", "@{u}"))
+    lines = res.stdout.splitlines()
+    if len(lines) >= 3 and lines[0] == "true":
+        return {
+            "root": r.root_posix,
+            "is_git": True,
+            "branch": lines[2].strip(),
+            "head": lines[1].strip(),
+            "upstream": lines[3].strip() if res.exit_code == 0 and len(lines) > 3 else None,
+        }
+
+    # not a repo, unborn branch, ...: fall back to individual queries
+    is_git = r.run_static(("rev-parse", "--is-inside-work-tree")).stdout.strip() == "true"
     if not is_git:
-        return {"root": r.root.as_posix(), "is_git": False}
+        return {"root": r.root_posix, "is_git": False}
 
-    branch = r.run(["rev-parse", "--abbrev-ref", "HEAD"]).stdout.strip()
-    head = r.run(["rev-parse", "HEAD"]).stdout.strip()
+    branch = r.run_static(("rev-parse", "--abbrev-ref", "HEAD")).stdout.strip()
+    head = r.run_static(("rev-parse", "HEAD")).stdout.strip()
 
     # upstream might not exist
-    upstream_res = r.run(["rev-parse", "--abbrev-ref", "@{u}"])
+    upstream_res = r.run_static(("rev-parse", "--abbrev-ref", "@{u}"))
     upstream = upstream_res.stdout.strip() if upstream_res.exit_code == 0 else None
 
     return {
-        "root": r.root.as_posix(),
+        "root": r.root_posix,
         "is_git": True,
         "branch": branch,
         "head": head,
@@ -40,10 +57,11 @@ def status_porcelain(root: str = ".", max_entries: int = 200) -> dict[str, Any]:
     Machine-readable status. Perfect for agents.
     """
     r = make_runner(root)
-    res = r.run(["status", "--porcelain=v1"])
-    entries = parse_status_porcelain(clean_lines(res.stdout))[: max(1, int(max_entries))]
+    res = r.run(["status", "--porcelain=v2", "-z"])
+    entries = parse_status_porcelain_v2(res.stdout)[: max(1, int(max_entries))]
     return {
-        "entries": [e.__dict__ for e in entries],
+        # tool schema: xy/path/orig_path (PorcelainEntry.kind is parser-internal)
+        "entries": [{"xy": e.xy, "path": e.path, "orig_path": e.orig_path} for e in entries],
         "count": len(entries),
         "git": res.to_dict(),
     }
@@ -124,7 +142,11 @@ def grep(
     Git-aware grep (search tracked content fast).
     """
     r = make_runner(root)
+    max_hits = max(1, int(max_hits))
     args = ["grep", "-n", "--no-color"]
+    if git_version() >= (2, 38):
+        # -m (git >= 2.38) caps matches per file inside git; the total is still capped below
+        args += ["-m", str(max_hits)]
     if ignore_case:
         args.append("-i")
     args.extend(["-e", pattern])
@@ -132,10 +154,12 @@ def grep(
         args.extend(["--", pathspec])
 
     res = r.run(args)
+    if res.exit_code != 1:  # 1 just means "no matches"
+        require_ok(res, context="grep")
     lines = clean_lines(res.stdout)
     return {
-        "hits": lines[: max(1, int(max_hits))],
-        "count": min(len(lines), max(1, int(max_hits))),
+        "hits": lines[:max_hits],
+        "count": min(len(lines), max_hits),
         "git": res.to_dict(),
     }
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Iterable
@@ -13,28 +14,26 @@ def _run(cmd: list[str], cwd: Path) -> str:
         cmd,
         cwd=str(cwd),
         stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
     )
-    return out.strip()
+    return out.decode("utf-8", "replace").strip()
 
 
 
-@pytest.fixture()
-def tmp_git_repo(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def _template_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
-    Creates a small deterministic git repo:
+    Builds the canonical small repo once per session:
       - 1 initial commit
       - known author identity
       - a couple of files + subdir
     """
-    repo = tmp_path / "repo"
+    repo = tmp_path_factory.mktemp("template") / "repo"
     repo.mkdir()
 
     _run(["git", "init"], repo)
-    _run(["git", "config", "user.email", "ci@example.com"], repo)
-    _run(["git", "config", "user.name", "CI"], repo)
+    # identity written straight into .git/config (saves two `git config` processes)
+    with (repo / ".git" / "config").open("a", encoding="utf-8") as f:
+        f.write("[user]\n\temail = ci@example.com\n\tname = CI\n")
 
     (repo / "README.md").write_text("# dummy\n", encoding="utf-8")
     (repo / "src").mkdir()
@@ -47,8 +46,25 @@ def tmp_git_repo(tmp_path: Path) -> Path:
 
 
 @pytest.fixture()
-def git_head(tmp_git_repo: Path) -> str:
-    return _run(["git", "rev-parse", "HEAD"], tmp_git_repo)
+def tmp_git_repo(tmp_path: Path, _template_repo: Path) -> Path:
+    """
+    A private copy of the session template repo (see _template_repo).
+    Plain copies, not hardlinks: tests edit files in place.
+    """
+    repo = tmp_path / "repo"
+    shutil.copytree(_template_repo, repo, symlinks=True)
+    return repo
+
+
+@pytest.fixture(scope="module")
+def tmp_git_repo_module(tmp_path_factory: pytest.TempPathFactory, _template_repo: Path) -> Path:
+    """
+    Like tmp_git_repo, but one copy shared by every test in a module.
+    Only for tests that leave the repo untouched.
+    """
+    repo = tmp_path_factory.mktemp("module") / "repo"
+    shutil.copytree(_template_repo, repo, symlinks=True)
+    return repo
 
 
 @pytest.fixture()
@@ -56,9 +72,40 @@ def make_change(tmp_git_repo: Path):
     """
     Helper: make working tree dirty in a predictable way.
     """
-    def _maker(relpath: str = "README.md", text: str = "changed\n") -> Path:
+    def _maker(relpath: str = "README.md", text: str = "changed\n", *, intent_to_add: bool = False) -> Path:
         p = tmp_git_repo / relpath
         p.parent.mkdir(parents=True, exist_ok=True)
         p.write_text(text, encoding="utf-8")
+        if intent_to_add:
+            # `git add -N`: tracked (so `commit -a` picks it up) but nothing staged yet
+            _run(["git", "add", "-N", relpath], tmp_git_repo)
         return p
     return _maker
+
+
+@pytest.fixture()
+def git_batch(tmp_git_repo: Path):
+    """
+    Long-running `git cat-file --batch-check` on tmp_git_repo for read-only object
+    queries, so tests don't fork a git process per lookup:
+      git_batch("HEAD:README.md") -> "<sha> blob"
+      git_batch(":staged.txt")    -> "<sha> blob"   (index, loaded at the first ":" query)
+      git_batch("HEAD:nope")      -> "HEAD:nope missing"
+    """
+    p = subprocess.Popen(
+        ["git", "-C", str(tmp_git_repo), "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    def query(spec: str) -> str:
+        p.stdin.write(spec + "\n")
+        p.stdin.flush()
+        return p.stdout.readline().rstrip("\n")
+
+    yield query
+    p.stdin.close()
+    p.wait(timeout=5)
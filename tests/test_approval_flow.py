@@ -12,10 +12,7 @@ def _git(cmd: list[str], cwd: Path) -> str:
         cmd,
         cwd=str(cwd),
         stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-    ).strip()
+    ).decode("utf-8", "replace").strip()
 
 
 def _status(cwd: Path) -> str:
@@ -140,3 +137,209 @@ def test_dangerous_commands_rejected_at_proposal(tmp_git_repo: Path, args):
 
     with pytest.raises((GitPolicyError, ValueError)):
         propose_git_command_tool(root=str(tmp_git_repo), args=args)
+
+
+def test_approval_flow_branch_changed_precondition(tmp_git_repo: Path, make_change):
+    from grounded_git_mcp.server import propose_git_command_tool, execute_confirmed_tool
+
+    branch = _git(["git", "rev-parse", "--abbrev-ref", "HEAD"], tmp_git_repo)
+    make_change("branch.txt", "v1\n")
+    proposal = propose_git_command_tool(root=str(tmp_git_repo), args=["add", "-A"], expected_branch=branch)
+    cid = proposal["confirmation_id"]
+
+    _git(["git", "checkout", "-b", "elsewhere"], tmp_git_repo)
+
+    with pytest.raises(ValueError, match="Branch changed"):
+        execute_confirmed_tool(
+            root=str(tmp_git_repo),
+            confirmation_id=cid,
+            user_confirmation=f"I CONFIRM {cid}",
+        )
+
+
+def test_approval_flow_expected_branch_matches(tmp_git_repo: Path, make_change):
+    from grounded_git_mcp.server import propose_git_command_tool, execute_confirmed_tool
+
+    branch = _git(["git", "rev-parse", "--abbrev-ref", "HEAD"], tmp_git_repo)
+    make_change("branch_ok.txt", "v1\n")
+    proposal = propose_git_command_tool(root=str(tmp_git_repo), args=["add", "-A"], expected_branch=branch)
+    cid = proposal["confirmation_id"]
+
+    res = execute_confirmed_tool(
+        root=str(tmp_git_repo),
+        confirmation_id=cid,
+        user_confirmation=f"I CONFIRM {cid}",
+    )
+    assert res["output"]["exit_code"] == 0
+
+
+def test_approval_flow_require_clean_precondition(tmp_git_repo: Path, make_change):
+    from grounded_git_mcp.server import propose_git_command_tool, execute_confirmed_tool
+
+    branch = _git(["git", "rev-parse", "--abbrev-ref", "HEAD"], tmp_git_repo)
+    make_change("dirty.txt", "v1\n")
+    proposal = propose_git_command_tool(
+        root=str(tmp_git_repo),
+        args=["add", "-A"],
+        expected_branch=branch,
+        require_clean=True,
+    )
+    cid = proposal["confirmation_id"]
+
+    with pytest.raises(ValueError, match="not clean"):
+        execute_confirmed_tool(
+            root=str(tmp_git_repo),
+            confirmation_id=cid,
+            user_confirmation=f"I CONFIRM {cid}",
+        )
+
+
+def test_repo_path_reuses_memoized_resolution(tmp_path: Path, monkeypatch):
+    import os
+
+    from grounded_git_mcp.core import security
+    from grounded_git_mcp.tools.approval_flow import _repo_path
+
+    expected = tmp_path.resolve()
+    calls = []
+    real = os.path.realpath
+    monkeypatch.setattr(os.path, "realpath", lambda p, *a, **k: calls.append(p) or real(p, *a, **k))
+
+    monkeypatch.setattr(security, "_VALIDATED_ROOTS", {})
+    assert _repo_path(str(tmp_path)) == expected
+    assert _repo_path(str(tmp_path)) == expected
+    assert calls == [str(tmp_path)]
+
+
+def test_propose_burst_reuses_head_lookup(tmp_git_repo: Path, monkeypatch):
+    from grounded_git_mcp.tools import approval_flow
+    from grounded_git_mcp.core.git_cat_file import CatFileBatch
+    from grounded_git_mcp.server import propose_git_command_tool
+
+    calls = []
+    real = CatFileBatch.resolve_ref
+    monkeypatch.setattr(CatFileBatch, "resolve_ref", lambda self, ref: calls.append(ref) or real(self, ref))
+    monkeypatch.setattr(approval_flow, "_HEAD_TTL_S", 60.0)
+
+    p1 = propose_git_command_tool(root=str(tmp_git_repo), args=["add", "-A"])
+    p2 = propose_git_command_tool(root=str(tmp_git_repo), args=["add", "-A"])
+    assert p1["preconditions"]["expected_head"] == p2["preconditions"]["expected_head"]
+    assert calls == ["HEAD"]
+
+
+def test_wrong_phrase_rejected_before_touching_store(tmp_git_repo: Path):
+    from grounded_git_mcp.server import execute_confirmed_tool
+
+    with pytest.raises(ValueError, match="Invalid confirmation phrase"):
+        execute_confirmed_tool(root=str(tmp_git_repo), confirmation_id="abc", user_confirmation="nope")
+    assert not (tmp_git_repo / ".grounded_git_mcp").exists()
+
+
+def test_non_ascii_phrase_is_rejected_not_crashing(tmp_git_repo: Path):
+    from grounded_git_mcp.server import execute_confirmed_tool
+
+    with pytest.raises(ValueError, match="Invalid confirmation phrase"):
+        execute_confirmed_tool(root=str(tmp_git_repo), confirmation_id="abc", user_confirmation="I CONFIRM äbc")
+
+
+def test_propose_skips_runner_on_cached_head(tmp_git_repo: Path, monkeypatch):
+    from grounded_git_mcp.tools import approval_flow
+    from grounded_git_mcp.server import propose_git_command_tool
+
+    monkeypatch.setattr(approval_flow, "_HEAD_TTL_S", 60.0)
+    propose_git_command_tool(root=str(tmp_git_repo), args=["add", "-A"])
+
+    def no_runner(*a, **k):
+        raise AssertionError("runner should not be needed on a HEAD cache hit")
+
+    monkeypatch.setattr(approval_flow, "get_runner", no_runner)
+    proposal = propose_git_command_tool(root=str(tmp_git_repo), args=["add", "-A"])
+    assert proposal["preconditions"]["expected_head"] == _git(["git", "rev-parse", "HEAD"], tmp_git_repo)
+
+
+def test_batch_propose_and_execute(tmp_git_repo: Path, make_change):
+    from grounded_git_mcp.server import execute_confirmed_many_tool, propose_git_commands_tool
+
+    make_change("batch.txt", "data\n")
+    batch = propose_git_commands_tool(
+        root=str(tmp_git_repo),
+        args_list=[["add", "batch.txt"], ["commit", "-m", "batch"]],
+    )
+    cids = [p["confirmation_id"] for p in batch["proposals"]]
+    assert len(set(cids)) == 2
+    assert batch["prompt_to_confirm_all"] == "I CONFIRM " + " ".join(cids)
+
+    with pytest.raises(ValueError):
+        execute_confirmed_many_tool(root=str(tmp_git_repo), confirmation_ids=cids, user_confirmation=f"I CONFIRM {cids[0]}")
+
+    # one shared precondition snapshot: the commit still runs after `add` dirtied the index
+    res = execute_confirmed_many_tool(
+        root=str(tmp_git_repo), confirmation_ids=cids, user_confirmation=batch["prompt_to_confirm_all"]
+    )
+    assert [r["output"]["exit_code"] for r in res["results"]] == [0, 0]
+    assert _git(["git", "log", "-1", "--pretty=%s"], tmp_git_repo) == "batch"
+
+
+def test_batch_propose_allows_repeated_commands(tmp_git_repo: Path):
+    from grounded_git_mcp.server import execute_confirmed_many_tool, propose_git_commands_tool
+
+    args = ["commit", "--allow-empty", "-m", "x"]
+    batch = propose_git_commands_tool(root=str(tmp_git_repo), args_list=[args, args])
+    cids = [p["confirmation_id"] for p in batch["proposals"]]
+    assert len(set(cids)) == 2
+
+    res = execute_confirmed_many_tool(
+        root=str(tmp_git_repo), confirmation_ids=cids, user_confirmation=batch["prompt_to_confirm_all"]
+    )
+    assert [r["output"]["exit_code"] for r in res["results"]] == [0, 0]
+    assert _git(["git", "log", "-3", "--pretty=%s"], tmp_git_repo).splitlines() == ["x", "x", "initial"]
+
+
+def test_batch_propose_rejects_whole_batch_on_critical(tmp_git_repo: Path):
+    from grounded_git_mcp.server import propose_git_commands_tool
+
+    with pytest.raises(ValueError, match="Command rejected"):
+        propose_git_commands_tool(root=str(tmp_git_repo), args_list=[["add", "-A"], ["push", "--force"]])
+    assert not (tmp_git_repo / ".grounded_git_mcp" / "confirmations.log.jsonl").exists()
+
+
+def test_proposal_classification_matches_classifier():
+    from grounded_git_mcp.core.classification import _READ, classify_git_args
+    from grounded_git_mcp.tools.approval_flow import _classify_for_proposal
+
+    for verb in _READ:
+        assert _classify_for_proposal([verb, "--x"]) == classify_git_args([verb, "--x"])
+    for args in (["push", "--force"], ["reset", "--hard"], ["clean", "-fd"]):
+        with pytest.raises(ValueError, match="Command rejected"):
+            _classify_for_proposal(args)
+
+
+def test_batch_execute_rejects_duplicate_ids(tmp_git_repo: Path, make_change):
+    from grounded_git_mcp.server import execute_confirmed_many_tool, propose_git_command_tool
+
+    make_change("dup.txt", "data\n")
+    cid = propose_git_command_tool(root=str(tmp_git_repo), args=["add", "dup.txt"])["confirmation_id"]
+
+    with pytest.raises(ValueError, match="Duplicate confirmation ids"):
+        execute_confirmed_many_tool(
+            root=str(tmp_git_repo), confirmation_ids=[cid, cid], user_confirmation=f"I CONFIRM {cid} {cid}"
+        )
+    assert "?? dup.txt" in _git(["git", "status", "--porcelain"], tmp_git_repo).splitlines()
+
+
+def test_batch_execute_checks_each_separately_proposed_token(tmp_git_repo: Path):
+    from grounded_git_mcp.server import execute_confirmed_many_tool, propose_git_command_tool
+
+    cids = [
+        propose_git_command_tool(
+            root=str(tmp_git_repo), args=["commit", "--allow-empty", "-m", msg]
+        )["confirmation_id"]
+        for msg in ("one", "two")
+    ]
+
+    # equal preconditions, but not one batch: the second commit sees the moved HEAD
+    with pytest.raises(ValueError, match="HEAD changed"):
+        execute_confirmed_many_tool(
+            root=str(tmp_git_repo), confirmation_ids=cids, user_confirmation="I CONFIRM " + " ".join(cids)
+        )
+    assert _git(["git", "log", "-1", "--pretty=%s"], tmp_git_repo) == "one"
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from grounded_git_mcp.core.atomic import atomic_write_bytes
+
+
+def test_atomic_write_bytes_replaces_content_and_leaves_no_temp(tmp_path: Path):
+    target = tmp_path / "db.json"
+    target.write_bytes(b"old")
+
+    atomic_write_bytes(target, b"new")
+
+    assert target.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["db.json"]
+
+
+def test_atomic_write_bytes_keeps_old_content_on_failure(tmp_path: Path, monkeypatch):
+    import os
+
+    target = tmp_path / "db.json"
+    target.write_bytes(b"old")
+
+    def boom(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", boom)
+    with pytest.raises(OSError):
+        atomic_write_bytes(target, b"new")
+
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["db.json"]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from grounded_git_mcp.core.confirmations import (
+    Confirmation,
+    FileConfirmationStore,
+    Preconditions,
+    command_hash,
+    get_store,
+)
+
+
+def _confirmation(cid: str, root: Path, args: list[str] | None = None) -> Confirmation:
+    args = args or ["add", "-A"]
+    return Confirmation(
+        confirmation_id=cid,
+        root=str(root),
+        args=args,
+        classification={"kind": "write", "risk": "medium", "reason": "test"},
+        cmd_hash=command_hash(args),
+        created_at=0,
+        expires_at=2**31,
+        preconditions=Preconditions(expected_head="abc"),
+    )
+
+
+def test_store_roundtrip(tmp_path: Path):
+    store = FileConfirmationStore(tmp_path)
+    store.put(_confirmation("c1", tmp_path))
+
+    c = store.get("c1")
+    assert c is not None
+    assert c.args == ["add", "-A"]
+    assert c.preconditions.expected_head == "abc"
+    assert c.can_use()
+
+    store.mark_used(c, result={})
+    c = store.get("c1")
+    assert c is not None and c.used == 1
+    assert not c.can_use()
+
+
+def test_store_sees_writes_from_another_instance(tmp_path: Path):
+    a = FileConfirmationStore(tmp_path)
+    b = FileConfirmationStore(tmp_path)
+
+    a.put(_confirmation("c1", tmp_path))
+    assert b.get("c1") is not None
+
+    b.mark_used(b.get("c1"), result={})
+    assert a.get("c1").used == 1
+
+
+def test_store_reloads_after_external_edit(tmp_path: Path):
+    store = FileConfirmationStore(tmp_path)
+    store.put(_confirmation("c1", tmp_path))
+    assert store.get("c1") is not None
+
+    d = tmp_path / ".grounded_git_mcp"
+    (d / "confirmations.log.jsonl").write_text("", encoding="utf-8")
+    (d / "confirmations.snapshot.json").write_text(json.dumps({}), encoding="utf-8")
+
+    assert store.get("c1") is None
+
+
+def test_store_compacts_log_into_snapshot(tmp_path: Path, monkeypatch):
+    import grounded_git_mcp.core.confirmations as confirmations
+
+    monkeypatch.setattr(confirmations, "_COMPACT_AFTER", 3)
+    store = FileConfirmationStore(tmp_path)
+    for i in range(4):
+        store.put(_confirmation(f"c{i}", tmp_path))
+
+    d = tmp_path / ".grounded_git_mcp"
+    assert (d / "confirmations.log.jsonl").read_text(encoding="utf-8") == ""
+    assert set(confirmations._decode_snapshot((d / "confirmations.snapshot.json").read_bytes())) == {
+        "c0", "c1", "c2", "c3"
+    }
+
+    store.put(_confirmation("c4", tmp_path))
+    store.mark_used(store.get("c0"), result={})
+
+    fresh = FileConfirmationStore(tmp_path)
+    assert fresh.get("c4") is not None
+    assert fresh.get("c0").used == 1
+
+
+def test_snapshot_msgpack_roundtrip_and_json_fallback(tmp_path: Path, monkeypatch):
+    import grounded_git_mcp.core.confirmations as confirmations
+
+    msgpack = pytest.importorskip("msgpack")
+    monkeypatch.setattr(confirmations, "msgpack", msgpack)
+    data = {"c1": _confirmation("c1", tmp_path).to_dict()}
+
+    blob = confirmations._encode_snapshot(data)
+    assert blob[:1] == confirmations._MSGPACK_MAGIC
+    assert confirmations._decode_snapshot(blob) == data
+    assert confirmations._decode_snapshot(json.dumps(data).encode("utf-8")) == data
+
+
+def test_snapshot_msgpack_requires_msgpack(monkeypatch):
+    import grounded_git_mcp.core.confirmations as confirmations
+
+    monkeypatch.setattr(confirmations, "msgpack", None)
+    assert confirmations._encode_snapshot({})[:1] == b"{"
+    with pytest.raises(RuntimeError):
+        confirmations._decode_snapshot(confirmations._MSGPACK_MAGIC + b"\x80")
+
+
+def test_store_migrates_legacy_confirmations_json(tmp_path: Path):
+    d = tmp_path / ".grounded_git_mcp"
+    d.mkdir()
+    legacy = {"c1": {**_confirmation("c1", tmp_path).__dict__, "preconditions": {}}}
+    (d / "confirmations.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    store = FileConfirmationStore(tmp_path)
+    assert store.get("c1") is not None
+
+
+def test_audit_lines_are_written_immediately(tmp_path: Path):
+    store = FileConfirmationStore(tmp_path)
+    audit = tmp_path / ".grounded_git_mcp" / "audit.jsonl"
+
+    store.audit("note", "c0")
+    assert [json.loads(ln)["action"] for ln in audit.read_text(encoding="utf-8").splitlines()] == ["note"]
+
+    store.put_many([_confirmation("c1", tmp_path), _confirmation("c2", tmp_path)])
+    lines = [json.loads(ln) for ln in audit.read_text(encoding="utf-8").splitlines()]
+    assert [(ln["action"], ln["confirmation_id"]) for ln in lines] == [
+        ("note", "c0"), ("proposed", "c1"), ("proposed", "c2")
+    ]
+
+
+def test_confirmation_dict_roundtrip_matches_asdict(tmp_path: Path):
+    from dataclasses import asdict
+
+    c = _confirmation("c1", tmp_path)
+    assert c.to_dict() == asdict(c)
+    assert Confirmation.from_dict(c.to_dict()) == c
+
+
+def test_get_store_is_shared_per_root(tmp_path: Path):
+    s1 = get_store(tmp_path)
+    assert get_store(tmp_path) is s1
+    s1.put(_confirmation("cid-shared", tmp_path))
+    assert get_store(tmp_path).get("cid-shared") is not None
+
+    shutil.rmtree(tmp_path / ".grounded_git_mcp")
+    s2 = get_store(tmp_path)
+    assert s2 is not s1
+    assert s2.get("cid-shared") is None
+
+
+def test_command_hash_is_unambiguous():
+    h = command_hash(["commit", "-m", "a b"])
+    assert len(h) == 32
+    assert h == command_hash(["commit", "-m", "a b"])
+    assert h != command_hash(["commit", "-m", "a", "b"])
+    assert command_hash(["a\nb"]) != command_hash(["a", "b"])
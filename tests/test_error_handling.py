@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import io
+import os
 import subprocess
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -15,11 +17,8 @@ def _git(cmd: list[str], cwd: Path) -> str:
         cmd,
         cwd=str(cwd),
         stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
     )
-    return out.strip()
+    return out.decode("utf-8", "replace").strip()
 
 
 def _commit_file(repo: Path, relpath: str, content: str, msg: str) -> None:
@@ -67,14 +66,13 @@ def test_git_command_timeout_handling(tmp_git_repo: Path, monkeypatch):
             self.pid = 12345
             self.returncode = None
             self._calls = 0
+            self.stdout = io.BytesIO(b"")
+            self.stderr = io.BytesIO(b"")
 
-        def communicate(self, timeout=None):
+        def wait(self, timeout=None):
             self._calls += 1
             if self._calls == 1:
                 raise subprocess.TimeoutExpired(cmd="git log --all", timeout=timeout)
-            return ("", "")
-
-        def wait(self, timeout=None):
             self.returncode = 0
             return 0
 
@@ -85,6 +83,7 @@ def test_git_command_timeout_handling(tmp_git_repo: Path, monkeypatch):
 
     import grounded_git_mcp.core.git_runner as gr
     monkeypatch.setattr(gr, "_kill_process_tree_windows", lambda pid: None)
+    monkeypatch.setattr(gr, "_kill_process_group_posix", lambda p: None)
 
     config = GitRunnerConfig(timeout_s=0.001)
     runner = SafeGitRunner(tmp_git_repo, config=config)
@@ -95,6 +94,17 @@ def test_git_command_timeout_handling(tmp_git_repo: Path, monkeypatch):
 
 
 
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell alias")
+def test_git_timeout_covers_helpers_holding_the_pipes(tmp_git_repo: Path):
+    """git exits at once, but a background helper keeps stdout open past the timeout."""
+    runner = SafeGitRunner(tmp_git_repo, config=GitRunnerConfig(timeout_s=1.0))
+
+    res = runner.run(["-c", "alias.bg=!sleep 8 &", "bg"], read_only=False)
+    assert res.timed_out is True
+    assert res.exit_code == 124
+    assert res.duration_ms < 4_000
+
+
 def test_git_runner_output_truncation_with_large_output(tmp_git_repo: Path):
     _commit_file(tmp_git_repo, "large.txt", "x" * 100_000, "add large")
 
@@ -104,6 +114,9 @@ def test_git_runner_output_truncation_with_large_output(tmp_git_repo: Path):
     res = runner.run(["show", "HEAD:large.txt"])
     assert res.output_truncated is True
     assert (len(res.stdout) + len(res.stderr)) <= 1000
+    # output is discarded past the ceiling, not by killing git
+    assert res.exit_code == 0
+    assert res.stdout == "x" * 1000
 
 
 def test_git_runner_stderr_is_captured(tmp_git_repo: Path):
@@ -151,12 +164,14 @@ def test_git_runner_argv_is_recorded(tmp_git_repo: Path):
 def test_git_runner_handles_subprocess_exception(tmp_git_repo: Path):
     runner = SafeGitRunner(tmp_git_repo)
 
-    def mock_communicate(*args, **kwargs):
+    def mock_wait(*args, **kwargs):
         raise RuntimeError("Unexpected error")
 
     with patch("subprocess.Popen") as popen:
         proc = MagicMock()
-        proc.communicate = mock_communicate
+        proc.wait = mock_wait
+        proc.stdout = io.BytesIO(b"")
+        proc.stderr = io.BytesIO(b"")
         proc.pid = 12345
         popen.return_value = proc
 
@@ -169,3 +184,101 @@ def test_error_types_inheritance():
     assert issubclass(InvalidRootError, GroundedGitMCPError)
     assert issubclass(GitPolicyError, GroundedGitMCPError)
     assert issubclass(GitExecutionError, GroundedGitMCPError)
+
+
+def test_git_runner_cache_is_opt_in_and_bump_invalidates(tmp_git_repo: Path):
+    cached = SafeGitRunner(tmp_git_repo, config=GitRunnerConfig(cache_ttl_s=60.0))
+    plain = SafeGitRunner(tmp_git_repo)
+
+    head1 = cached.run(["rev-parse", "HEAD"]).stdout.strip()
+    _commit_file(tmp_git_repo, "moved.txt", "x\n", "move head")
+    head2 = plain.run(["rev-parse", "HEAD"]).stdout.strip()
+    assert head1 != head2
+
+    # memoized until bump()
+    assert cached.run(["rev-parse", "HEAD"]).stdout.strip() == head1
+    cached.bump()
+    assert cached.run(["rev-parse", "HEAD"]).stdout.strip() == head2
+
+    # non-pure commands are never memoized
+    assert cached.run(["status", "--porcelain"]) is not cached.run(["status", "--porcelain"])
+
+
+def test_git_runner_run_static_matches_run(tmp_git_repo: Path):
+    runner = SafeGitRunner(tmp_git_repo)
+
+    a = runner.run(["rev-parse", "HEAD"])
+    b = runner.run_static(("rev-parse", "HEAD"))
+    assert a.stdout == b.stdout
+    assert b.argv == ["git", "rev-parse", "HEAD"]
+
+    for _ in range(2):  # validation is remembered, but must still reject
+        with pytest.raises(GitPolicyError):
+            runner.run_static(("push",))
+
+
+def test_git_runner_run_static_validation_memo_is_bounded(tmp_git_repo: Path, monkeypatch):
+    import grounded_git_mcp.core.git_runner as gr
+
+    monkeypatch.setattr(gr, "_CACHE_MAX_ENTRIES", 4)
+    runner = SafeGitRunner(tmp_git_repo)
+    for i in range(10):
+        runner.run_static(("rev-parse", f"HEAD~{i}"))
+    assert len(runner._validated) <= 4
+
+
+def test_get_runner_reuses_instance_per_root_and_config(tmp_git_repo: Path):
+    from grounded_git_mcp.core.git_runner import get_runner
+
+    a = get_runner(str(tmp_git_repo))
+    assert get_runner(tmp_git_repo) is a
+    assert get_runner(tmp_git_repo, GitRunnerConfig(timeout_s=9.0)) is not a
+
+
+def test_require_ok_keeps_stderr_tail_and_structured_context():
+    from grounded_git_mcp.core.git_runner import require_ok
+    from grounded_git_mcp.core.models import GitRunResult
+
+    res = GitRunResult(
+        argv=["git", "show", "nope"],
+        root="/r",
+        stdout="",
+        stderr="x" * 50_000 + "\nfatal: bad revision 'nope'\n",
+        exit_code=128,
+        duration_ms=1,
+        timed_out=False,
+        output_truncated=False,
+    )
+    with pytest.raises(GitExecutionError) as ei:
+        require_ok(res, context="read")
+
+    err = ei.value
+    assert err.message.startswith("read failed: ")
+    assert err.message.endswith("fatal: bad revision 'nope'")
+    assert len(err.message) < 2_100
+    assert err.context == {"argv": ["git", "show", "nope"], "exit_code": 128, "timed_out": False}
+
+
+def test_error_message_and_context_rendering():
+    from grounded_git_mcp.core.errors import GitExecutionError
+
+    assert str(GitPolicyError("blocked")) == "blocked"
+    assert str(GitExecutionError()) == "GitExecutionError"
+
+    err = GitExecutionError("failed", context={"exit_code": 1})
+    assert err.message == "failed"
+    assert err.args == ("failed",)
+    assert str(err) == "failed | context={'exit_code': 1}"
+
+
+def test_git_runner_env_overlay_does_not_leak_into_template(tmp_git_repo: Path):
+    runner = SafeGitRunner(tmp_git_repo)
+
+    base = runner._build_env(None)
+    assert base["GIT_TERMINAL_PROMPT"] == "0"
+    assert runner._build_env(None) is base
+
+    merged = runner._build_env({"GROUNDED_GIT_MCP_TEST": "1"})
+    assert merged["GROUNDED_GIT_MCP_TEST"] == "1"
+    assert merged["GIT_TERMINAL_PROMPT"] == "0"
+    assert "GROUNDED_GIT_MCP_TEST" not in base
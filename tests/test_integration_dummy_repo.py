@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import os
 import subprocess
+import time
 from pathlib import Path
 
 import pytest
@@ -17,14 +19,11 @@ def _run(cmd: list[str], cwd: Path) -> str:
         cmd,
         cwd=str(cwd),
         stderr=subprocess.STDOUT,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
     )
-    return out.strip()
+    return out.decode("utf-8", "replace").strip()
 
 
-def test_integration_repo_tree_and_file_at_ref(tmp_git_repo: Path):
+def test_integration_repo_tree_and_file_at_ref(tmp_git_repo: Path, git_batch):
     """
     Sanity integration:
     - repo tree lists known files
@@ -40,6 +39,8 @@ def test_integration_repo_tree_and_file_at_ref(tmp_git_repo: Path):
     paths = {it["path"] for it in tree["items"] if isinstance(it, dict) and "path" in it}
     assert "README.md" in paths
     assert "src/app.py" in paths
+    assert git_batch("HEAD:README.md").endswith(" blob")
+    assert git_batch("HEAD:src").endswith(" tree")
 
     readme = read_file_resource(root=str(tmp_git_repo), ref="HEAD", path="README.md")
     assert isinstance(readme, dict)
@@ -56,10 +57,8 @@ def test_integration_diff_range_after_change(tmp_git_repo: Path, make_change):
     """
     from grounded_git_mcp.server import diff_range_resource
 
-    make_change("x.txt", "hello\n")
-
-    _run(["git", "add", "-A"], tmp_git_repo)
-    _run(["git", "commit", "-m", "add x"], tmp_git_repo)
+    make_change("x.txt", "hello\n", intent_to_add=True)
+    _run(["git", "commit", "-am", "add x"], tmp_git_repo)
 
     out = diff_range_resource(root=str(tmp_git_repo), base="HEAD~1", head="HEAD")
     assert isinstance(out, dict)
@@ -82,7 +81,7 @@ def test_integration_policy_enforced_even_in_integration(tmp_git_repo: Path):
         runner.run(["push"])  
 
 
-def test_integration_approval_flow_write_command(tmp_git_repo: Path, make_change):
+def test_integration_approval_flow_write_command(tmp_git_repo: Path, make_change, git_batch):
     """
     Stage 5 integration:
     propose -> confirm -> execute for a medium-risk write command (git add -A).
@@ -105,11 +104,216 @@ def test_integration_approval_flow_write_command(tmp_git_repo: Path, make_change
         user_confirmation=confirm_text,
     )
 
+    # status check runs on the git pool while the result is inspected
+    from grounded_git_mcp.core.git_runner import AsyncGitRunner, get_runner
+
+    status = AsyncGitRunner(get_runner(str(tmp_git_repo))).submit(["status", "--porcelain=v1"])
+
     assert isinstance(result, dict)
     assert "output" in result
     assert isinstance(result["output"], dict)
 
     assert result["output"].get("exit_code") == 0
 
-    status = _run(["git", "status", "--porcelain=v1"], tmp_git_repo)
-    assert "A  stage_me.txt" in status or "A  stage_me.txt".replace("/", "\\") in status
+    # staged == present in the index (":path"), but not in HEAD
+    assert git_batch(":stage_me.txt").endswith(" blob")
+    assert git_batch("HEAD:stage_me.txt").endswith(" missing")
+    assert "A  stage_me.txt" in status.result(timeout=10).stdout.splitlines()
+
+
+def test_integration_persistent_session_tracks_head(tmp_git_repo: Path, make_change):
+    """
+    CatFileBatch resolves refs over the root's long-lived cat-file process:
+    - matches rev-parse, and sees new commits without respawning
+    - unknown refs still surface as GitExecutionError (rev-parse fallback)
+    """
+    from grounded_git_mcp.core.errors import GitExecutionError
+    from grounded_git_mcp.core.git_cat_file import get_cat_file
+    from grounded_git_mcp.tools.common import make_runner
+
+    session = get_cat_file(make_runner(str(tmp_git_repo)))
+    first = session.resolve_ref("HEAD")
+    assert first == _run(["git", "rev-parse", "HEAD"], tmp_git_repo)
+    pid = session.pid
+
+    make_change("y.txt", "y\n", intent_to_add=True)
+    _run(["git", "commit", "-am", "y"], tmp_git_repo)
+    head = _run(["git", "rev-parse", "HEAD"], tmp_git_repo)
+    assert head != first
+    assert session.resolve_ref("HEAD") == head
+    assert session.pid == pid
+
+    with pytest.raises(GitExecutionError):
+        session.resolve_ref("no-such-ref")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell alias")
+def test_integration_persistent_session_times_out_stalled_process(tmp_git_repo: Path, monkeypatch):
+    """A cat-file process that never answers is killed after the runner timeout; rev-parse answers."""
+    from grounded_git_mcp.core import git_cat_file
+    from grounded_git_mcp.core.git_runner import GitRunnerConfig, SafeGitRunner
+
+    monkeypatch.setattr(git_cat_file, "_BATCH_ARGV", ("git", "-c", "alias.stall=!sleep 30", "stall"))
+    session = git_cat_file.CatFileBatch(SafeGitRunner(tmp_git_repo, GitRunnerConfig(timeout_s=0.5)))
+
+    start = time.monotonic()
+    assert session.resolve_ref("HEAD") == _run(["git", "rev-parse", "HEAD"], tmp_git_repo)
+    assert time.monotonic() - start < 3.0
+    assert session.pid is None  # killed; respawned on the next lookup
+
+
+def test_integration_repo_info_single_rev_parse(tmp_git_repo: Path):
+    """
+    repo_info answers from one fused rev-parse:
+    - no upstream configured -> upstream is None
+    - upstream configured -> abbreviated upstream name
+    """
+    from grounded_git_mcp.tools.git_tools import repo_info
+
+    branch = _run(["git", "rev-parse", "--abbrev-ref", "HEAD"], tmp_git_repo)
+    info = repo_info(str(tmp_git_repo))
+    assert info["is_git"] is True
+    assert info["branch"] == branch
+    assert info["head"] == _run(["git", "rev-parse", "HEAD"], tmp_git_repo)
+    assert info["upstream"] is None
+
+    _run(["git", "branch", "side"], tmp_git_repo)
+    _run(["git", "config", f"branch.{branch}.remote", "."], tmp_git_repo)
+    _run(["git", "config", f"branch.{branch}.merge", "refs/heads/side"], tmp_git_repo)
+    assert repo_info(str(tmp_git_repo))["upstream"] == "side"
+
+
+def test_integration_grep_caps_hits(tmp_git_repo: Path, make_change):
+    from grounded_git_mcp.tools.git_tools import grep
+
+    make_change("many.txt", "needle\n" * 50)
+    _run(["git", "add", "many.txt"], tmp_git_repo)
+    out = grep("needle", root=str(tmp_git_repo), max_hits=3)
+    assert out["count"] == 3
+    assert out["hits"] == ["many.txt:1:needle", "many.txt:2:needle", "many.txt:3:needle"]
+    assert out["git"]["exit_code"] == 0
+
+
+def test_integration_read_file_uses_one_cat_file_process(tmp_git_repo: Path, monkeypatch):
+    """
+    Repeated read_file_at_ref calls are served by one `git cat-file --batch`
+    process; missing paths still raise through the `git show` fallback.
+    """
+    from grounded_git_mcp.core.errors import GitExecutionError
+    from grounded_git_mcp.resources.file_at_ref import read_file_at_ref
+
+    for i in range(100):
+        (tmp_git_repo / f"f{i}.txt").write_text(f"line {i}\r\nnext\n", encoding="utf-8")
+    _run(["git", "add", "-A"], tmp_git_repo)
+    _run(["git", "commit", "-m", "files"], tmp_git_repo)
+
+    spawned = []
+    real_popen = subprocess.Popen
+
+    def counting_popen(argv, *a, **kw):
+        spawned.append(list(argv))
+        return real_popen(argv, *a, **kw)
+
+    monkeypatch.setattr(subprocess, "Popen", counting_popen)
+
+    for i in range(100):
+        out = read_file_at_ref(root=str(tmp_git_repo), ref="HEAD", path=f"f{i}.txt")
+        assert out["content"] == f"line {i}\nnext"
+    assert [a[:3] for a in spawned] == [["git", "cat-file", "--batch"]]
+
+    with pytest.raises(GitExecutionError):
+        read_file_at_ref(root=str(tmp_git_repo), ref="HEAD", path="nope.txt")
+
+
+def test_repo_tree_no_size_by_default(tmp_git_repo: Path):
+    from grounded_git_mcp.resources.repo_tree import repo_tree
+
+    items = repo_tree(root=str(tmp_git_repo), ref="HEAD")["items"]
+    assert items == [{"path": "README.md"}, {"path": "src/app.py"}]
+
+    sized = repo_tree(root=str(tmp_git_repo), ref="HEAD", include_size=True)["items"]
+    assert sized == [{"path": "README.md", "size": 8}, {"path": "src/app.py", "size": 12}]
+
+
+def test_diff_range_raw_only(tmp_git_repo: Path):
+    from grounded_git_mcp.resources.diff_range import diff_range
+
+    for i in range(1000):
+        (tmp_git_repo / f"gen_{i}.txt").write_text(f"{i}\n", encoding="utf-8")
+    _run(["git", "add", "-A"], tmp_git_repo)
+    _run(["git", "mv", "README.md", "README.txt"], tmp_git_repo)
+    _run(["git", "commit", "-m", "many"], tmp_git_repo)
+
+    out = diff_range(root=str(tmp_git_repo), base="HEAD~1", head="HEAD", include_patch=False)
+    assert out["diff"] == ""
+    assert out["files"]["counts"] == {"A": 1000, "R": 1}
+    assert {"status": "R100", "from": "README.md", "to": "README.txt"} in out["files"]["files"]
+    assert "--patch" not in out["git"]["argv"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a POSIX shell alias")
+def test_integration_cat_file_stall_falls_back_to_show(tmp_git_repo: Path, monkeypatch):
+    """A stalled cat-file process is killed after the runner timeout and git show answers."""
+    from grounded_git_mcp.core import git_cat_file
+    from grounded_git_mcp.core.git_runner import GitRunnerConfig, SafeGitRunner
+
+    monkeypatch.setattr(git_cat_file, "_BATCH_ARGV", ("git", "-c", "alias.stall=!sleep 30", "stall"))
+    runner = SafeGitRunner(tmp_git_repo, GitRunnerConfig(timeout_s=0.5))
+
+    start = time.monotonic()
+    for _ in range(2):  # the lock is released after the first timeout
+        assert git_cat_file.read_blob(runner, "HEAD:README.md") is None
+    assert time.monotonic() - start < 4.0
+    assert git_cat_file.get_cat_file(runner).pid is None
+
+    monkeypatch.undo()
+    res = git_cat_file.read_blob(runner, "HEAD:README.md")
+    assert res is not None and res.stdout == "# dummy\n"
+
+
+def test_cat_file_processes_are_closed_on_eviction(tmp_path: Path, _template_repo: Path, monkeypatch):
+    """One cat-file process per root; the least recently used one is closed past _MAX_BATCHES."""
+    import shutil
+
+    from grounded_git_mcp.core import git_cat_file
+    from grounded_git_mcp.core.git_runner import GitRunnerConfig, SafeGitRunner
+
+    monkeypatch.setattr(git_cat_file, "_BATCHES", type(git_cat_file._BATCHES)())
+    monkeypatch.setattr(git_cat_file, "_MAX_BATCHES", 2)
+
+    runners = []
+    for i in range(3):
+        repo = tmp_path / f"r{i}"
+        shutil.copytree(_template_repo, repo, symlinks=True)
+        runners.append(SafeGitRunner(repo, GitRunnerConfig()))
+
+    a = git_cat_file.get_cat_file(runners[0])
+    a.resolve_ref("HEAD")
+    proc = a._pipe._proc
+    assert git_cat_file.get_cat_file(SafeGitRunner(runners[0].root, GitRunnerConfig(timeout_s=9.0))) is a
+
+    for r in runners[1:]:
+        git_cat_file.get_cat_file(r).resolve_ref("HEAD")
+    assert proc.poll() is not None and a.pid is None
+    assert list(git_cat_file._BATCHES) == [r.root for r in runners[1:]]
+
+    git_cat_file._close_batches()
+    assert not git_cat_file._BATCHES
+
+
+def test_integration_grep_without_max_count_on_old_git(tmp_git_repo: Path, make_change, monkeypatch):
+    """git < 2.38 has no `grep -m`: the cap is applied in Python only; real failures raise."""
+    from grounded_git_mcp.core.errors import GitExecutionError
+    from grounded_git_mcp.tools import git_tools
+
+    monkeypatch.setattr(git_tools, "git_version", lambda: (2, 34, 1))
+    make_change("many.txt", "needle\n" * 5)
+    _run(["git", "add", "many.txt"], tmp_git_repo)
+
+    out = git_tools.grep("needle", root=str(tmp_git_repo), max_hits=2)
+    assert "-m" not in out["git"]["argv"]
+    assert out["count"] == 2
+
+    assert git_tools.grep("no-such-text", root=str(tmp_git_repo))["count"] == 0
+    with pytest.raises(GitExecutionError):
+        git_tools.grep("needle", root=str(tmp_git_repo), pathspec=":(bogus)x")
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import pytest
+
+from grounded_git_mcp.core.limits import truncate_lines
+
+
+@pytest.mark.parametrize("text", ["", "\n", "a", "a\n", "a\nb", "a\nb\n", "a\n\n", "\n\nx\n"])
+@pytest.mark.parametrize("max_lines", [1, 2, 5])
+def test_truncate_lines_matches_splitlines(text, max_lines):
+    lines = text.splitlines()
+    expected = ("\n".join(lines[:max_lines]), len(lines) > max_lines, len(lines))
+    assert truncate_lines(text, max_lines) == expected
+
+
+def test_truncate_lines_large_diff():
+    text = "+" + "x" * 99 + "\n"
+    big = text * 100_000  # ~10 MB
+    out, truncated, total = truncate_lines(big, 2_000)
+    assert truncated and total == 100_000
+    assert out == (text * 2_000)[:-1]
+
+    small = text * 10
+    assert truncate_lines(small, 2_000) == (small[:-1], False, 10)
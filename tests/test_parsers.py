@@ -3,18 +3,33 @@ from __future__ import annotations
 import pytest
 
 
-def test_parse_status_porcelain_basic():
-    from grounded_git_mcp.core.parsers import parse_status_porcelain
-
-    raw = "\n".join(
-        [
-            " M README.md",
-            "A  src/new.py",
-            "?? notes.txt",
-        ]
-    )
-
-    out = parse_status_porcelain(raw.splitlines())
+_OID = "0" * 40
+_BASIC_V1 = "\n".join(
+    [
+        " M README.md",
+        "A  src/new.py",
+        "?? notes.txt",
+    ]
+)
+_BASIC_V2 = "\0".join(
+    [
+        "# branch.oid " + _OID,
+        f"1 .M N... 100644 100644 100644 {_OID} {_OID} README.md",
+        f"1 A. N... 000000 100644 100644 {_OID} {_OID} src/new.py",
+        "? notes.txt",
+        "",
+    ]
+)
+
+
+@pytest.mark.parametrize("version", ["v1", "v2"])
+def test_parse_status_porcelain_basic(version):
+    from grounded_git_mcp.core.parsers import parse_status_porcelain, parse_status_porcelain_v2
+
+    if version == "v1":
+        out = parse_status_porcelain(_BASIC_V1.splitlines())
+    else:
+        out = parse_status_porcelain_v2(_BASIC_V2)
 
     assert isinstance(out, list)
     assert len(out) == 3
@@ -48,3 +63,90 @@ def test_parse_status_porcelain_ignores_empty_lines():
     assert len(out) == 1
     assert out[0].path == "a.txt"
     assert out[0].xy == " M"
+
+
+def test_parse_status_porcelain_accepts_raw_text():
+    from grounded_git_mcp.core.parsers import parse_status_porcelain
+
+    raw = " M a.txt\nR  old.txt -> new.txt\n\n?? b.txt\n"
+    out = parse_status_porcelain(raw)
+
+    assert [(e.xy, e.path, e.orig_path) for e in out] == [
+        (" M", "a.txt", None),
+        ("R ", "new.txt", "old.txt"),
+        ("??", "b.txt", None),
+    ]
+
+
+def test_diff_summary_from_name_status_counts_by_status_letter():
+    from grounded_git_mcp.core.parsers import diff_summary_from_name_status
+
+    raw = "M\ta.txt\nA\tb.txt\nM\tc.txt\nR100\told.txt\tnew.txt\n\n"
+    out = diff_summary_from_name_status(raw.splitlines())
+
+    assert out["counts"] == {"M": 2, "A": 1, "R": 1}
+    assert type(out["counts"]) is dict
+    assert out["total"] == 4
+    assert out["files"][3] == {"status": "R100", "from": "old.txt", "to": "new.txt"}
+
+
+@pytest.mark.parametrize(
+    "xy, kind",
+    [(" M", "modified"), ("A ", "added"), ("D ", "deleted"), ("R ", "renamed"), ("UU", "unmerged"),
+     ("AA", "unmerged"), ("??", "untracked"), ("!!", "ignored"), ("XY", "unknown")],
+)
+def test_parse_status_porcelain_kind(xy, kind):
+    from grounded_git_mcp.core.parsers import parse_status_porcelain, parse_status_porcelain_v2
+
+    line = f"{xy} a.txt -> b.txt" if kind == "renamed" else f"{xy} a.txt"
+    assert parse_status_porcelain(line)[0].kind == kind
+
+    v2xy = xy.replace(" ", ".")
+    if xy in ("??", "!!"):
+        rec = f"{xy[0]} a.txt\0"
+    elif kind == "renamed":
+        rec = f"2 {v2xy} N... 100644 100644 100644 {_OID} {_OID} R100 b.txt\0a.txt\0"
+    elif kind == "unmerged":
+        rec = f"u {v2xy} N... 100644 100644 100644 100644 {_OID} {_OID} {_OID} a.txt\0"
+    else:
+        rec = f"1 {v2xy} N... 100644 100644 100644 {_OID} {_OID} a.txt\0"
+    assert parse_status_porcelain_v2(rec)[0].kind == kind
+
+
+def test_parse_status_porcelain_arrow_only_split_for_renames():
+    from grounded_git_mcp.core.parsers import parse_status_porcelain
+
+    out = parse_status_porcelain("?? odd -> name.txt")
+    assert (out[0].path, out[0].orig_path) == ("odd -> name.txt", None)
+
+
+def test_parse_status_porcelain_large_batch():
+    from grounded_git_mcp.core.parsers import parse_status_porcelain
+
+    raw = "\n".join([" M file_%d.txt" % i for i in range(50_000)])
+    out = parse_status_porcelain(raw)
+
+    assert len(out) == 50_000
+    assert (out[0].path, out[-1].path) == ("file_0.txt", "file_49999.txt")
+    assert all(e.xy == " M" and e.kind == "modified" for e in out)
+
+
+def test_parse_status_porcelain_v2_renames_unmerged_and_spaces():
+    from grounded_git_mcp.core.parsers import parse_status_porcelain_v2
+
+    raw = "\0".join(
+        [
+            f"2 R. N... 100644 100644 100644 {_OID} {_OID} R100 new name.txt",
+            "old -> x.txt",
+            f"u UU N... 100644 100644 100644 100644 {_OID} {_OID} {_OID} both.txt",
+            "! build/",
+            "",
+        ]
+    )
+    out = parse_status_porcelain_v2(raw)
+
+    assert [(e.xy, e.path, e.orig_path, e.kind) for e in out] == [
+        ("R ", "new name.txt", "old -> x.txt", "renamed"),
+        ("UU", "both.txt", None, "unmerged"),
+        ("!!", "build/", None, "ignored"),
+    ]
@@ -3,6 +3,13 @@ from __future__ import annotations
 import pytest
 
 from grounded_git_mcp.core.errors import GitPolicyError
+from grounded_git_mcp.core.git_runner import SafeGitRunner
+
+
+@pytest.fixture(scope="module")
+def safe_runner(tmp_git_repo_module) -> SafeGitRunner:
+    """One runner for every parametrization below (none of them modify the repo)."""
+    return SafeGitRunner(root=str(tmp_git_repo_module))
 
 
 @pytest.mark.parametrize(
@@ -15,17 +22,13 @@ from grounded_git_mcp.core.errors import GitPolicyError
         ["rebase", "--onto", "x", "y"],
     ],
 )
-def test_policy_blocks_dangerous_commands(tmp_git_repo, args):
+def test_policy_blocks_dangerous_commands(safe_runner, args):
     """
     SafeGitRunner should block dangerous subcommands at policy level.
     In your implementation SafeGitRunner(root=...) is required.
     """
-    from grounded_git_mcp.core.git_runner import SafeGitRunner
-
-    runner = SafeGitRunner(root=str(tmp_git_repo))
-
     with pytest.raises(GitPolicyError):
-        runner.run(args)
+        safe_runner.run(args)
 
 
 @pytest.mark.parametrize(
@@ -38,15 +41,12 @@ def test_policy_blocks_dangerous_commands(tmp_git_repo, args):
         ["show", "HEAD:README.md"],
     ],
 )
-def test_policy_allows_safe_read_commands(tmp_git_repo, args):
+def test_policy_allows_safe_read_commands(safe_runner, args):
     """
     Safe read commands should run successfully and return a GitRunResult-like object.
     We assert stable fields rather than exact text.
     """
-    from grounded_git_mcp.core.git_runner import SafeGitRunner
-
-    runner = SafeGitRunner(root=str(tmp_git_repo))
-    res = runner.run(args)
+    res = safe_runner.run(args)
 
     assert hasattr(res, "exit_code")
     assert hasattr(res, "stdout")
@@ -82,3 +82,52 @@ def test_classification_marks_read_commands_as_read():
     assert c["kind"] == "read"
     assert c["risk"] in ("low", "medium", "high", "critical")
     assert isinstance(c.get("reason", ""), str)
+
+
+def test_classification_result_is_not_shared_between_calls():
+    from grounded_git_mcp.core.classification import classify_git_args
+
+    a = classify_git_args(["commit", "-m", "x"])
+    a["risk"] = "low"
+    b = classify_git_args(["commit", "-m", "y"])
+
+    assert b["risk"] == "high"
+    assert b == {"kind": "write", "risk": "high", "reason": "Write subcommand: commit"}
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["checkout", "-f", "main"], ["branch", "--force", "x"], ["branch", "-D", "x"], ["rm", "-rf", "src"],
+     ["tag", "-m", "msg", "-f", "v1"]],
+)
+def test_classification_escalates_destructive_flags(args):
+    from grounded_git_mcp.core.classification import classify_git_args
+
+    assert classify_git_args(args)["risk"] == "critical"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["commit", "-m", "-f"], ["add", "-f", "ignored.log"], ["config", "-f", "file", "k", "v"],
+     ["checkout", "main", "--", "-f"], ["tag", "-m", "--force", "v1"]],
+)
+def test_classification_ignores_flag_lookalikes(args):
+    from grounded_git_mcp.core.classification import classify_git_args
+
+    assert classify_git_args(args)["risk"] != "critical"
+
+
+def test_classification_uses_lookup_tables():
+    from grounded_git_mcp.core import classification
+
+    # one dict lookup per subcommand (plus its own flag set), not a scan over rules
+    assert isinstance(classification._SUBCOMMAND_TABLE, dict)
+    assert all(isinstance(f, frozenset) for f in classification._DESTRUCTIVE_FLAGS.values())
+    for sub in classification._READ | classification._WRITE | classification._NETWORK | classification._DENY:
+        assert classification.classify_git_args([sub]) == dict(classification._SUBCOMMAND_TABLE[sub])
+
+
+@pytest.mark.parametrize("flag", ["--hard", "-fd", "--onto", "-f", "--FORCE"])
+def test_policy_blocks_dangerous_flags_on_allowed_subcommands(safe_runner, flag):
+    with pytest.raises(GitPolicyError):
+        safe_runner.run(["log", flag, "HEAD"])
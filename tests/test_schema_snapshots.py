@@ -2,87 +2,65 @@ from __future__ import annotations
 
 from typing import Any
 
-import pytest
-
-
-def assert_schema(obj: Any, schema: Any, path: str = "$") -> None:
-    """
-    A tiny schema matcher that is *stable*:
-    - schema can be: type (e.g. str), dict of schemas, list schema (single element = item schema), or callable predicate.
+import fastjsonschema
+
+
+def _object(**props: Any) -> dict[str, Any]:
+    """JSON Schema for a dict that must contain (at least) `props`."""
+    return {"type": "object", "properties": props, "required": list(props)}
+
+
+_STR = {"type": "string"}
+_BOOL = {"type": "boolean"}
+_INT = {"type": "integer"}
+_DICT = {"type": "object"}
+
+# Compiled once at import: fastjsonschema generates a flat validator per schema.
+_VALIDATE_REPO_TREE = fastjsonschema.compile(_object(
+    root=_STR,
+    ref=_STR,
+    items={"type": "array", "items": _object(path=_STR)},
+    truncated=_BOOL,
+    git=_DICT,
+))
+_VALIDATE_DIFF_RANGE = fastjsonschema.compile(_object(
+    root=_STR,
+    base=_STR,
+    head=_STR,
+    diff=_STR,
+    truncated=_BOOL,
+    git=_DICT,
+))
+_VALIDATE_READ_FILE = fastjsonschema.compile(_object(
+    root=_STR,
+    ref=_STR,
+    path=_STR,
+    content=_STR,
+    truncated=_BOOL,
+    line_count=_INT,
+    git=_DICT,
+))
+_VALIDATE_STATUS = fastjsonschema.compile(_object(
+    count=_INT,
+    entries={"type": "array", "items": _DICT},
+    git=_DICT,
+))
+
+
+def test_resources_return_stable_schema(tmp_git_repo):
     """
-    if isinstance(schema, type):
-        assert isinstance(obj, schema), f"{path}: expected {schema.__name__}, got {type(obj).__name__}"
-        return
-
-    if callable(schema) and not isinstance(schema, dict):
-        assert schema(obj), f"{path}: predicate failed for value={obj!r}"
-        return
-
-    if isinstance(schema, dict):
-        assert isinstance(obj, dict), f"{path}: expected dict, got {type(obj).__name__}"
-        for k, subschema in schema.items():
-            assert k in obj, f"{path}: missing key '{k}'"
-            assert_schema(obj[k], subschema, f"{path}.{k}")
-        return
-
-    if isinstance(schema, list):
-        assert isinstance(obj, list), f"{path}: expected list, got {type(obj).__name__}"
-        if len(schema) == 0:
-            return
-        item_schema = schema[0]
-        for i, item in enumerate(obj):
-            assert_schema(item, item_schema, f"{path}[{i}]")
-        return
-
-    raise TypeError(f"Unsupported schema type at {path}: {schema!r}")
-
-
-@pytest.mark.parametrize("resource_name", ["repo_tree", "diff_range", "read_file"])
-def test_resources_return_stable_schema(resource_name, tmp_git_repo, git_head):
-    """
-    Snapshot-style schema tests:
+    Snapshot-style schema tests (all three resources against one repo):
     - ensures contract for resources stays stable
     - does NOT pin volatile values (hashes, timestamps)
     """
     from grounded_git_mcp.server import repo_tree_resource, diff_range_resource, read_file_resource
 
-    if resource_name == "repo_tree":
-        out = repo_tree_resource(root=str(tmp_git_repo), ref="HEAD")
-        assert_schema(out, {
-            "root": str,
-            "ref": str,
-            "items": [ 
-                {
-                    "path": str,
-                }
-            ],
-            "truncated": bool,
-            "git": dict,
-        })
-
-    elif resource_name == "diff_range":
-        # diff between HEAD~0..HEAD is usually empty; we assert schema only.
-        out = diff_range_resource(root=str(tmp_git_repo), base="HEAD~0", head="HEAD")
-        assert_schema(out, {
-            "root": str,
-            "base": str,
-            "head": str,
-            "diff": str,
-            "truncated": bool,
-            "git": dict,
-        })
-
-    elif resource_name == "read_file":
-        out = read_file_resource(root=str(tmp_git_repo), ref="HEAD", path="README.md")
-        assert_schema(out, {
-            "root": str,
-            "ref": str,
-            "path": str,
-            "content": str,
-            "truncated": bool,
-            "line_count": int,
-            "git": dict,
-        })
+    _VALIDATE_REPO_TREE(repo_tree_resource(root=str(tmp_git_repo), ref="HEAD"))
+
+    # diff between HEAD~0..HEAD is usually empty; we assert schema only.
+    _VALIDATE_DIFF_RANGE(diff_range_resource(root=str(tmp_git_repo), base="HEAD~0", head="HEAD"))
+
+    _VALIDATE_READ_FILE(read_file_resource(root=str(tmp_git_repo), ref="HEAD", path="README.md"))
 
 
 def test_tools_output_schema_is_stable(tmp_git_repo):
@@ -93,8 +71,12 @@ def test_tools_output_schema_is_stable(tmp_git_repo):
     from grounded_git_mcp.tools.git_tools import status_porcelain
 
     out = status_porcelain(root=str(tmp_git_repo), max_entries=200)
-    assert_schema(out, {
-        "count": int,
-        "entries": [dict],  
-        "git": dict,
-    })
+    _VALIDATE_STATUS(out)
+
+
+def test_status_entries_keep_their_keys(tmp_git_repo, make_change):
+    from grounded_git_mcp.tools.git_tools import status_porcelain
+
+    make_change("README.md", "changed\n")
+    out = status_porcelain(root=str(tmp_git_repo))
+    assert out["entries"] == [{"xy": " M", "path": "README.md", "orig_path": None}]
@@ -27,12 +27,16 @@ def test_resolve_root_with_file_instead_of_directory(tmp_path: Path):
 
 
 def test_resolve_root_expands_user_home(tmp_path: Path, monkeypatch):
-    # We only verify that expanduser() is called and result is absolute.
+    # "~" is expanded against the home directory captured at import (_HOME).
     # This avoids depending on the real OS home folder.
-    monkeypatch.setattr(Path, "expanduser", lambda self: tmp_path if str(self) == "~" else self)
+    from grounded_git_mcp.core import security
+
+    (tmp_path / "proj").mkdir()
+    monkeypatch.setattr(security, "_HOME", str(tmp_path))
     result = resolve_root("~")
     assert result.is_absolute()
     assert result == tmp_path.resolve()
+    assert resolve_root("~/proj") == (tmp_path / "proj").resolve()
 
 
 def test_ensure_within_root_allows_valid_subpath(tmp_path: Path):
@@ -101,3 +105,127 @@ def test_ensure_within_root_handles_symlinks_correctly(tmp_path: Path):
 
     with pytest.raises(InvalidRootError, match="Path escapes root"):
         ensure_within_root(root, link)
+
+
+def test_resolve_root_relative_path_follows_cwd(tmp_path: Path, monkeypatch):
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+
+    monkeypatch.chdir(a)
+    assert resolve_root(".") == a.resolve()
+    monkeypatch.chdir(b)
+    assert resolve_root(".") == b.resolve()
+
+
+def test_resolve_root_revalidates_after_ttl(tmp_path: Path, monkeypatch):
+    from grounded_git_mcp.core import security
+
+    d = tmp_path / "gone"
+    d.mkdir()
+    assert resolve_root(d) == d.resolve()
+
+    monkeypatch.setattr(security, "_ROOT_TTL_S", 0.0)
+    d.rmdir()
+    with pytest.raises(InvalidRootError, match="Root does not exist:"):
+        resolve_root(d)
+
+
+def test_resolve_root_follows_retargeted_symlink_after_ttl(tmp_path: Path, monkeypatch):
+    from grounded_git_mcp.core import security
+
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    cur = tmp_path / "cur"
+    try:
+        cur.symlink_to(a, target_is_directory=True)
+    except OSError:
+        pytest.skip("Symlinks not supported or not permitted on this system")
+    assert resolve_root(cur) == a.resolve()
+
+    monkeypatch.setattr(security, "_ROOT_TTL_S", 0.0)
+    cur.unlink()
+    cur.symlink_to(b, target_is_directory=True)
+    assert resolve_root(cur) == b.resolve()
+
+
+def test_ensure_within_root_rejects_sibling_with_common_prefix(tmp_path: Path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    sibling = tmp_path / "repo-other"
+    sibling.mkdir()
+
+    with pytest.raises(InvalidRootError, match="Path escapes root"):
+        ensure_within_root(root, sibling)
+
+
+def test_resolve_root_cache_hit(tmp_path: Path, monkeypatch):
+    import os
+
+    calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **k: calls.append(p) or real_stat(p, *a, **k))
+
+    first = resolve_root(tmp_path)
+    n = len(calls)
+    assert n >= 1
+    assert resolve_root(tmp_path) is first
+    assert len(calls) == n
+
+
+def test_ensure_within_root_reresolves_root_after_change(tmp_path: Path):
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    root = tmp_path / "root"
+    try:
+        root.symlink_to(a, target_is_directory=True)
+    except OSError:
+        pytest.skip("Symlinks not supported or not permitted on this system")
+
+    assert ensure_within_root(root, a / "f") == (a / "f").resolve()
+
+    root.unlink()
+    root.symlink_to(b, target_is_directory=True)
+    assert ensure_within_root(root, b / "f") == (b / "f").resolve()
+    with pytest.raises(InvalidRootError, match="Path escapes root"):
+        ensure_within_root(root, a / "f")
+
+
+def test_resolve_root_single_stat_call(tmp_path: Path, monkeypatch):
+    import os
+
+    from grounded_git_mcp.core import security
+
+    resolve_root(tmp_path)
+    monkeypatch.setattr(security, "_ROOT_TTL_S", 0.0)
+
+    calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **k: calls.append(p) or real_stat(p, *a, **k))
+
+    resolve_root(tmp_path)
+    assert len(calls) == 1
+
+
+def test_ensure_within_root_symlinked_dir_below_root(tmp_path: Path):
+    root = tmp_path / "repo"
+    (root / "real").mkdir(parents=True)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    try:
+        (root / "inner").symlink_to(root / "real", target_is_directory=True)
+        (root / "escape").symlink_to(outside, target_is_directory=True)
+    except OSError:
+        pytest.skip("Symlinks not supported or not permitted on this system")
+
+    assert ensure_within_root(root, root / "inner" / "f.txt") == (root / "real" / "f.txt").resolve()
+    with pytest.raises(InvalidRootError, match="Path escapes root"):
+        ensure_within_root(root, root / "escape" / "f.txt")
+    # ".." after a symlink must follow the link, not collapse textually
+    with pytest.raises(InvalidRootError, match="Path escapes root"):
+        ensure_within_root(root, root / "escape" / ".." / "outside")